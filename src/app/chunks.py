@@ -3,40 +3,196 @@
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 from app.config import Config, get_config
 from app.schemas import CanonicalNote, Chunk, Section
 
 logger = logging.getLogger(__name__)
 
+# Paragraph boundaries: two or more consecutive newlines
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\n+')
+# Minimum number of sections before chunking is spread across a thread pool
+_PARALLEL_CHUNKING_MIN_SECTIONS = 4
+# Sentence-ending punctuation
+_SENTENCE_END_CHARS = frozenset(".!?")
+# Texts at least this long are scanned for sentence boundaries with numpy
+_VECTORIZED_SENTENCE_SCAN_MIN_CHARS = 2048
+
+if NUMPY_AVAILABLE:
+    _SENTENCE_END_CODES = np.array([ord(c) for c in _SENTENCE_END_CHARS], dtype=np.uint32)
+    # Every code point for which str.isspace() is true lies below U+3001
+    _WHITESPACE_CODES = np.array([c for c in range(0x3001) if chr(c).isspace()], dtype=np.uint32)
 
-def split_into_paragraphs(text: str) -> List[str]:
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """Find sentence spans in a single linear scan.
+    
+    A boundary is sentence-ending punctuation (. ! ?) followed by whitespace.
+    The punctuation stays with its sentence and the whitespace is dropped.
+    
+    Args:
+        text: Text to scan
+        
+    Returns:
+        List[Tuple[int, int]]: (start, end) offsets of each sentence in text
+    """
+    if NUMPY_AVAILABLE and len(text) >= _VECTORIZED_SENTENCE_SCAN_MIN_CHARS:
+        return _sentence_spans_vectorized(text)
+    
+    spans = []
+    start = 0
+    i = 0
+    n = len(text)
+    while i < n - 1:
+        if text[i] in _SENTENCE_END_CHARS and text[i + 1].isspace():
+            spans.append((start, i + 1))
+            j = i + 2
+            while j < n and text[j].isspace():
+                j += 1
+            start = j
+            i = j
+        else:
+            i += 1
+    if start < n:
+        spans.append((start, n))
+    return spans
+
+
+def _sentence_spans_vectorized(text: str) -> List[Tuple[int, int]]:
+    """Find the same sentence spans as _sentence_spans using numpy.
+    
+    The text is viewed as an array of code points (UTF-32), so array
+    indices are character offsets and non-ASCII text needs no special
+    handling. Every punctuation mark followed by whitespace is a boundary;
+    the next sentence starts at the first non-whitespace character after it.
+    
+    Args:
+        text: Text to scan
+        
+    Returns:
+        List[Tuple[int, int]]: (start, end) offsets of each sentence in text
+    """
+    n = len(text)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    is_space = np.isin(codes, _WHITESPACE_CODES)
+    is_end = np.isin(codes[:-1], _SENTENCE_END_CODES)
+    ends = np.flatnonzero(is_end & is_space[1:]) + 1
+    
+    non_space = np.flatnonzero(~is_space)
+    next_idx = np.searchsorted(non_space, ends + 1)
+    starts = np.full(len(ends), n, dtype=np.int64)
+    in_range = next_idx < len(non_space)
+    starts[in_range] = non_space[next_idx[in_range]]
+    
+    span_starts = [0, *starts.tolist()]
+    span_ends = [*ends.tolist(), n]
+    spans = list(zip(span_starts, span_ends))
+    # The text after the last boundary is only a sentence if it is non-empty
+    if span_starts[-1] >= n:
+        spans.pop()
+    return spans
+
+
+def split_into_sentences(text: str) -> List[str]:
+    """Split text at sentence boundaries.
+    
+    A boundary is sentence-ending punctuation (. ! ?) followed by whitespace.
+    The punctuation stays with its sentence and the whitespace is dropped.
+    
+    Args:
+        text: Text to split into sentences
+        
+    Returns:
+        List[str]: List of sentences
+    """
+    return [text[start:end] for start, end in _sentence_spans(text)]
+
+
+def split_into_paragraphs(text: str) -> List[Tuple[str, int]]:
     """Split text into paragraphs (preserve paragraph boundaries).
     
-    Paragraphs are separated by double newlines (\n\n).
+    Paragraphs are separated by double newlines (\n\n). Each paragraph is
+    returned with its offset in text, so text[offset:offset + len(paragraph)]
+    is exactly the paragraph.
     
     Args:
         text: Text to split into paragraphs
         
     Returns:
-        List[str]: List of paragraph texts (may be empty strings)
+        List[Tuple[str, int]]: List of (paragraph, offset) pairs, empty paragraphs removed
     """
-    # Split on double newlines (empty lines)
-    paragraphs = text.split("\n\n")
-    # Remove leading/trailing whitespace from each paragraph
-    paragraphs = [p.strip() for p in paragraphs]
-    # Filter out empty paragraphs
-    paragraphs = [p for p in paragraphs if p]
+    paragraphs = []
+    cursor = 0
+    # Split on double newlines (empty lines); runs of 3+ newlines count as one break
+    for boundary in _PARAGRAPH_SPLIT_RE.finditer(text):
+        _append_paragraph(paragraphs, text, cursor, boundary.start())
+        cursor = boundary.end()
+    _append_paragraph(paragraphs, text, cursor, len(text))
     return paragraphs
 
 
+def _append_paragraph(paragraphs: List[Tuple[str, int]], text: str, start: int, end: int) -> None:
+    """Strip text[start:end] and append it with its offset if non-empty."""
+    segment = text[start:end]
+    stripped = segment.lstrip()
+    if stripped:
+        paragraphs.append((stripped.rstrip(), start + len(segment) - len(stripped)))
+
+
+def _split_long_paragraph_spans(paragraph: str, max_size: int) -> List[Tuple[int, int]]:
+    """Split a long paragraph at sentence boundaries into (start, end) spans.
+    
+    Args:
+        paragraph: Paragraph text to split
+        max_size: Maximum size for each split piece
+        
+    Returns:
+        List[Tuple[int, int]]: Offsets of each piece within paragraph
+    """
+    if len(paragraph) <= max_size:
+        return [(0, len(paragraph))]
+    
+    # Merge sentences into pieces that don't exceed max_size
+    pieces = []
+    piece_start = None
+    piece_end = 0
+    for start, end in _sentence_spans(paragraph):
+        if piece_start is None:
+            piece_start = start
+        elif end - piece_start > max_size:
+            # Adding this sentence would exceed max_size, save current piece
+            pieces.append((piece_start, piece_end))
+            piece_start = start
+        piece_end = end
+    
+    # Add remaining piece
+    if piece_start is not None:
+        pieces.append((piece_start, piece_end))
+    
+    return pieces if pieces else [(0, len(paragraph))]
+
+
 def split_long_paragraph(paragraph: str, max_size: int) -> List[str]:
     """Split a long paragraph at sentence boundaries.
     
     If a paragraph exceeds max_size, split it at sentence boundaries
     (period, exclamation, question mark followed by space or newline).
+    Each piece is a verbatim slice of the paragraph.
     
     Args:
         paragraph: Paragraph text to split
@@ -45,48 +201,7 @@ def split_long_paragraph(paragraph: str, max_size: int) -> List[str]:
     Returns:
         List[str]: List of paragraph pieces (may be single item if paragraph is short)
     """
-    if len(paragraph) <= max_size:
-        return [paragraph]
-    
-    # Split at sentence boundaries: . ! ? followed by space or newline
-    sentence_pattern = r'([.!?])\s+'
-    sentences = re.split(sentence_pattern, paragraph)
-    
-    # Reconstruct sentences (pattern captures punctuation, so we need to merge)
-    reconstructed = []
-    for i in range(0, len(sentences) - 1, 2):
-        if i + 1 < len(sentences):
-            sentence = sentences[i] + sentences[i + 1]
-            reconstructed.append(sentence)
-        else:
-            reconstructed.append(sentences[i])
-    if len(sentences) % 2 == 1:
-        reconstructed.append(sentences[-1])
-    
-    # Merge sentences into chunks that don't exceed max_size
-    chunks = []
-    current_chunk = ""
-    
-    for sentence in reconstructed:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
-            
-        # If adding this sentence would exceed max_size, save current chunk
-        if current_chunk and len(current_chunk) + len(sentence) + 1 > max_size:
-            chunks.append(current_chunk.strip())
-            current_chunk = sentence
-        else:
-            if current_chunk:
-                current_chunk += " " + sentence
-            else:
-                current_chunk = sentence
-    
-    # Add remaining chunk
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-    
-    return chunks if chunks else [paragraph]
+    return [paragraph[start:end] for start, end in _split_long_paragraph_spans(paragraph, max_size)]
 
 
 def create_chunks_from_section(
@@ -118,34 +233,44 @@ def create_chunks_from_section(
     # Extract section text
     section_text = canonical_note.text[section.start_char:section.end_char]
     
-    # Split into paragraphs
+    # Split into paragraphs, keeping each paragraph's offset within the section
     paragraphs = split_into_paragraphs(section_text)
     
     # Handle long paragraphs
     processed_paragraphs = []
-    for para in paragraphs:
+    for para, para_offset in paragraphs:
         if len(para) > max_paragraph_size:
-            processed_paragraphs.extend(split_long_paragraph(para, max_paragraph_size))
+            for piece_start, piece_end in _split_long_paragraph_spans(para, max_paragraph_size):
+                processed_paragraphs.append((para[piece_start:piece_end], para_offset + piece_start))
         else:
-            processed_paragraphs.append(para)
+            processed_paragraphs.append((para, para_offset))
     
     # Merge paragraphs into chunks with overlap
+    # Chunk text is accumulated as a list of segments and joined once per chunk
     chunks = []
-    current_chunk = ""
+    current_parts: List[str] = []
+    current_len = 0
     current_start_char = section.start_char
+    # End offset (within the section) of the last paragraph added to the current chunk
+    last_para_end_in_section = 0
     chunk_idx = 0
+    # Section-local chunk_id prefix (create_chunks_from_sections renumbers globally)
+    chunk_id_prefix = section.title.lower().replace(' ', '_')
     
-    for para in processed_paragraphs:
-        para_with_newline = para + "\n\n"
+    for para, para_offset in processed_paragraphs:
+        para_len = len(para)
+        # Paragraph plus its "\n\n" separator, kept as separate segments
+        needed = para_len + 2
         
         # If adding this paragraph would exceed chunk_size, save current chunk
-        if current_chunk and len(current_chunk) + len(para_with_newline) > chunk_size:
+        if current_parts and current_len + needed > chunk_size:
             # Save current chunk
-            chunk_end_char = section.start_char + len(section_text[:len(current_chunk)])
+            chunk_text = "".join(current_parts).strip()
+            chunk_end_char = section.start_char + last_para_end_in_section
             chunks.append(
                 Chunk(
-                    chunk_id=f"{section.title.lower().replace(' ', '_')}_{chunk_idx}",
-                    text=current_chunk.strip(),
+                    chunk_id=f"{chunk_id_prefix}_{chunk_idx}",
+                    text=chunk_text,
                     start_char=current_start_char,
                     end_char=chunk_end_char,
                     section_title=section.title,
@@ -155,34 +280,34 @@ def create_chunks_from_section(
             
             # Start new chunk with overlap
             # Calculate overlap: take last chunk_overlap chars from current chunk
-            if chunk_overlap > 0 and len(current_chunk) > chunk_overlap:
-                overlap_text = current_chunk[-chunk_overlap:]
+            if chunk_overlap > 0 and len(chunk_text) > chunk_overlap:
+                overlap_text = chunk_text[-chunk_overlap:]
                 # Try to start overlap at word boundary
                 overlap_start = overlap_text.find(" ")
                 if overlap_start > 0:
                     overlap_text = overlap_text[overlap_start + 1:]
-                current_chunk = overlap_text + "\n\n" + para
+                current_parts = [overlap_text, "\n\n", para, "\n\n"]
+                current_len = len(overlap_text) + 2 + needed
                 current_start_char = chunk_end_char - len(overlap_text)
             else:
-                current_chunk = para
-                current_start_char = chunk_end_char
+                current_parts = [para, "\n\n"]
+                current_len = needed
+                current_start_char = section.start_char + para_offset
         else:
-            if current_chunk:
-                current_chunk += para_with_newline
-            else:
-                current_chunk = para
-                # Find the actual start position of this paragraph in the section
-                para_start_in_section = section_text.find(para)
-                if para_start_in_section >= 0:
-                    current_start_char = section.start_char + para_start_in_section
+            if not current_parts:
+                current_start_char = section.start_char + para_offset
+            current_parts.append(para)
+            current_parts.append("\n\n")
+            current_len += needed
+        last_para_end_in_section = para_offset + para_len
     
     # Add final chunk
-    if current_chunk:
-        chunk_end_char = section.end_char
+    if current_parts:
+        chunk_end_char = section.start_char + last_para_end_in_section
         chunks.append(
             Chunk(
-                chunk_id=f"{section.title.lower().replace(' ', '_')}_{chunk_idx}",
-                text=current_chunk.strip(),
+                chunk_id=f"{chunk_id_prefix}_{chunk_idx}",
+                text="".join(current_parts).strip(),
                 start_char=current_start_char,
                 end_char=chunk_end_char,
                 section_title=section.title,
@@ -199,6 +324,11 @@ def create_chunks_from_sections(
 ) -> List[Chunk]:
     """Create chunks from all sections.
     
+    Sections are chunked independently; when config.chunking_workers > 1 and
+    there are enough sections, they are chunked on a thread pool. Chunk ids
+    are assigned sequentially afterwards, so the result does not depend on
+    the number of workers.
+    
     Args:
         sections: List of Section objects
         canonical_note: CanonicalNote for text access
@@ -210,18 +340,26 @@ def create_chunks_from_sections(
     if config is None:
         config = get_config()
     
-    all_chunks = []
-    global_chunk_idx = 0
-    
-    for section in sections:
-        section_chunks = create_chunks_from_section(
+    def chunk_section(section: Section) -> List[Chunk]:
+        return create_chunks_from_section(
             section,
             canonical_note,
             config.chunk_size,
             config.chunk_overlap,
             config.max_paragraph_size,
         )
-        
+    
+    if config.chunking_workers > 1 and len(sections) >= _PARALLEL_CHUNKING_MIN_SECTIONS:
+        with ThreadPoolExecutor(max_workers=config.chunking_workers) as executor:
+            # map() yields results in submission order
+            chunks_per_section = list(executor.map(chunk_section, sections))
+    else:
+        chunks_per_section = [chunk_section(section) for section in sections]
+    
+    all_chunks = []
+    global_chunk_idx = 0
+    
+    for section_chunks in chunks_per_section:
         # Update chunk_ids to be globally unique
         for chunk in section_chunks:
             chunk.chunk_id = f"chunk_{global_chunk_idx}"
@@ -232,6 +370,16 @@ def create_chunks_from_sections(
     return all_chunks
 
 
+def _dumps_json(data: dict) -> bytes:
+    """Serialize data to compact UTF-8 JSON, using orjson when available.
+    
+    The json fallback uses orjson's separators, so both write the same bytes.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 def save_chunks(chunks: List[Chunk], output_path: Path) -> None:
     """Save chunks to JSON file.
     
@@ -242,23 +390,30 @@ def save_chunks(chunks: List[Chunk], output_path: Path) -> None:
     Raises:
         ValueError: If chunks cannot be validated
     """
-    # Validate chunks
+    # Validate chunks (explicit checks so validation also runs under python -O)
     for chunk in chunks:
-        try:
-            assert chunk.start_char < chunk.end_char
-            assert len(chunk.text) > 0
-        except Exception as e:
-            raise ValueError(f"Invalid chunk: {chunk.chunk_id}: {e}") from e
-    
-    # Convert to dict for JSON serialization
-    chunks_data = {
-        "chunks": [chunk.model_dump() for chunk in chunks],
-    }
-    
-    # Save to file
+        if chunk.start_char >= chunk.end_char or not chunk.text:
+            raise ValueError(
+                f"Invalid chunk: {chunk.chunk_id}: "
+                f"bounds={chunk.start_char},{chunk.end_char} len(text)={len(chunk.text)}"
+            )
+    
+    # Stream one compact chunk per line instead of building and indenting
+    # the whole document in memory; the file is still a single JSON object
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(chunks_data, f, indent=2, ensure_ascii=False)
+    with open(output_path, "wb") as f:
+        f.write(b'{"chunks": [')
+        for i, chunk in enumerate(chunks):
+            f.write(b",\n" if i else b"\n")
+            # Chunk is flat, so a dict literal avoids model_dump()'s recursive conversion
+            f.write(_dumps_json({
+                "chunk_id": chunk.chunk_id,
+                "text": chunk.text,
+                "start_char": chunk.start_char,
+                "end_char": chunk.end_char,
+                "section_title": chunk.section_title,
+            }))
+        f.write(b"\n]}\n")
     
     logger.info(f"Saved {len(chunks)} chunks to {output_path}")
 
@@ -4,17 +4,22 @@ This module provides the CLI entrypoint using Typer.
 """
 
 import glob
+import os
+import stat
 import sys
 from pathlib import Path
 
-# Add src directory to Python path so imports work without PYTHONPATH=src
-_script_dir = Path(__file__).parent
-_project_root = _script_dir.parent.parent
-_src_dir = _project_root / "src"
-if str(_src_dir) not in sys.path:
-    sys.path.insert(0, str(_src_dir))
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+# When run as a script (python src/app/cli.py), add src to the Python path so
+# app.* imports work; the installed clinical-note-parser entry point and
+# imports from tests don't need this
+if __name__ == "__main__" and not __package__:
+    _project_root = Path(__file__).parent.parent.parent
+    _src_dir_str = str(_project_root / "src")
+    _project_root_str = str(_project_root)
+    if _src_dir_str not in sys.path:
+        sys.path.insert(0, _src_dir_str)
+    if _project_root_str not in sys.path:
+        sys.path.insert(0, _project_root_str)
 
 try:
     import typer
@@ -22,11 +27,107 @@ except ImportError:
     print("Error: typer is not installed. Install it with: uv add typer")
     sys.exit(1)
 
-from app.config import Config, get_config
-from app.pipeline import run_pipeline, run_pipeline_batch
-
 app = typer.Typer(help="Clinical Note Parser - Extract structured information from clinical notes")
 
+# Directories searched (after the current directory) for bare input filenames.
+# Kept as strings and joined with os.path.join; only the match becomes a Path.
+_SEARCH_BASES: tuple[str, ...] = (
+    "data/archive/mitsamples_pdf",
+    "data/archive/mtsamples_pdf",
+    "data/archive/mtsamples_pdf/mtsamples_pdf",
+)
+
+
+def _is_bare_filename(name: str) -> bool:
+    """Check that name has no directory separators (either / or \\)."""
+    return not ("/" in name or "\\" in name)
+
+
+def _try_stat(path: str | Path) -> os.stat_result | None:
+    """Stat path, returning None if it does not exist or cannot be accessed."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _is_regular_file(path: str | Path) -> bool:
+    """Check that path is a regular file with a single stat call."""
+    st = _try_stat(path)
+    return st is not None and stat.S_ISREG(st.st_mode)
+
+
+def _absolute_path(path: str | Path) -> Path:
+    """Make path absolute without touching the filesystem.
+    
+    Unlike Path.resolve() this does not follow symlinks (no realpath
+    syscalls); input files are opened by path, so a symlinked PDF works
+    the same either way.
+    """
+    return Path(os.path.abspath(path))
+
+
+def _resolve_input_path(name: str, search_bases: tuple[str, ...] = _SEARCH_BASES) -> Path | None:
+    """Find an input file relative to the current directory or the search bases.
+    
+    Absolute paths are only checked as given.
+    
+    Args:
+        name: Filename (e.g., "570.pdf") or path to the file
+        search_bases: Directories to search after the current directory
+        
+    Returns:
+        Path | None: Absolute path of the first match, or None if not found
+    """
+    if os.path.isabs(name):
+        return Path(name) if _is_regular_file(name) else None
+    # One stat per candidate, stopping at the first hit. For a single name
+    # this beats listing each directory; batches use _index_search_bases.
+    for candidate in (name, *(os.path.join(base, name) for base in search_bases)):
+        if _is_regular_file(candidate):
+            return _absolute_path(candidate)
+    return None
+
+
+def _index_search_bases(search_bases: tuple[str, ...] = _SEARCH_BASES) -> dict[str, str]:
+    """Map filenames in the current directory and search bases to their directory.
+    
+    Each existing directory is listed once with os.scandir, so looking up
+    many bare filenames costs one directory scan per base instead of a stat
+    per filename per base. The first directory in search order wins.
+    
+    Args:
+        search_bases: Directories to search after the current directory
+        
+    Returns:
+        dict[str, str]: Filename to containing directory for regular files
+    """
+    index: dict[str, str] = {}
+    for base in (".", *search_bases):
+        try:
+            with os.scandir(base) as entries:
+                for entry in entries:
+                    if entry.name not in index and entry.is_file():
+                        index[entry.name] = base
+        except OSError:
+            continue
+    return index
+
+
+def _glob_files(pattern: str) -> list[Path]:
+    """Expand a glob pattern into the files it matches.
+    
+    Uses glob.glob with recursive=True, so "**" matches any number of
+    directories and hidden names only match patterns that start with ".".
+    
+    Args:
+        pattern: Glob pattern (e.g., "*.pdf", "data/**/*.pdf")
+        
+    Returns:
+        list[Path]: Matching regular files
+    """
+    return [Path(match) for match in glob.glob(pattern, recursive=True) if os.path.isfile(match)]
+
 
 @app.command()
 def process(
@@ -38,6 +139,7 @@ def process(
     summary_only: bool = typer.Option(False, "--summary-only", help="Only generate summary (skip planning, evaluation)"),
     plan_only: bool = typer.Option(False, "--plan-only", help="Only generate plan (requires summary generation first, skips evaluation)"),
     no_evaluation: bool = typer.Option(False, "--no-evaluation", help="Generate TOC, summary, and plan but skip evaluation"),
+    force_health_check: bool = typer.Option(False, "--force-health-check", help="Always probe Ollama instead of reusing a successful check from the last 30 seconds"),
 ):
     """Process a clinical note (PDF or .txt) and extract structured information.
     
@@ -66,86 +168,51 @@ def process(
         python cli.py 570.pdf --model llama3.2 --output-dir my_results
     """
     # Validate mutually exclusive flags
-    flags_set = [toc_only, summary_only, plan_only]
-    if sum(flags_set) > 1:
+    mode_flag_count = toc_only + summary_only + plan_only
+    if mode_flag_count > 1:
         typer.echo("Error: --toc-only, --summary-only, and --plan-only are mutually exclusive.", err=True)
         typer.echo("Please specify only one of these flags.", err=True)
         raise typer.Exit(1)
     
-    if no_evaluation and any(flags_set):
+    if no_evaluation and mode_flag_count:
         typer.echo("Error: --no-evaluation cannot be used with --toc-only, --summary-only, or --plan-only.", err=True)
         raise typer.Exit(1)
     
-    # Convert input path to Path object
-    # If it's just a filename, search in common locations
-    input_file = Path(input_path)
-    
-    # If it's just a filename (no directory separators), search for it
-    if "/" not in input_path and "\\" not in input_path:
-        # Search in common locations
-        search_paths = [
-            Path(input_path),  # Current directory
-            Path("data/archive/mitsamples_pdf") / input_path,
-            Path("data/archive/mtsamples_pdf") / input_path,
-            Path("data/archive/mtsamples_pdf/mtsamples_pdf") / input_path,
-        ]
-        
-        for candidate in search_paths:
-            if candidate.exists() and candidate.is_file():
-                input_file = candidate.resolve()
-                break
-        else:
-            # File not found in any location
-            typer.echo(f"Error: File '{input_path}' not found in current directory or common locations.", err=True)
-            typer.echo(f"Searched in:", err=True)
-            for search_path in search_paths:
-                typer.echo(f"  - {search_path}", err=True)
-            raise typer.Exit(1)
-    elif not input_file.is_absolute():
-        # Relative path - try to resolve it
-        if not input_file.exists():
-            # Try relative to current directory
-            candidate = Path.cwd() / input_file
-            if candidate.exists():
-                input_file = candidate
-            else:
-                # Try in data directories
-                for base_dir in ["data/archive/mitsamples_pdf", "data/archive/mtsamples_pdf", "data/archive/mtsamples_pdf/mtsamples_pdf"]:
-                    candidate = Path(base_dir) / input_file
-                    if candidate.exists():
-                        input_file = candidate
-                        break
+    # Look for the file as given, then in common locations
+    resolved = _resolve_input_path(input_path)
+    if resolved is not None:
+        input_file = resolved
+    elif _is_bare_filename(input_path):
+        # File not found in any location
+        typer.echo(f"Error: File '{input_path}' not found in current directory or common locations.", err=True)
+        typer.echo(f"Searched in:", err=True)
+        for search_path in (input_path, *(os.path.join(base, input_path) for base in _SEARCH_BASES)):
+            typer.echo(f"  - {search_path}", err=True)
+        raise typer.Exit(1)
+    else:
+        # Paths are passed through so the pipeline reports why they can't be used
+        input_file = Path(input_path)
     
     # Convert output_dir to Path if provided
     output_path = Path(output_dir) if output_dir else None
     
-    # Get or create config
+    # Get or create config (imported lazily: pydantic and dotenv are not needed for --help)
+    from app.config import get_config
     config = get_config()
     if model:
         config.model_name = model
     
-    # Check if LLM is needed and if Ollama is available
+    # Run pipeline (imported lazily: it pulls in the PDF, LLM and evaluation stacks)
+    from app.pipeline import run_pipeline, start_ollama_check
+    
+    # Check Ollama in the background while the document is loaded; run_pipeline
+    # waits for the result and reports it before the first LLM step
     needs_llm = not toc_only  # TOC-only doesn't need LLM
+    ollama_check = None
     if needs_llm:
         typer.echo("Checking Ollama availability...", err=False)
-        from app.pipeline import check_ollama_availability
-        is_available, error_msg = check_ollama_availability(config)
-        if not is_available:
-            typer.echo("\n" + "="*70, err=True)
-            typer.echo("ERROR: Ollama is not available or model is not installed", err=True)
-            typer.echo("="*70, err=True)
-            typer.echo(f"\n{error_msg}", err=True)
-            typer.echo("\nTo fix this issue:", err=True)
-            typer.echo("  1. Ensure Ollama is installed: https://ollama.ai", err=True)
-            typer.echo("  2. Start Ollama service (if not running)", err=True)
-            typer.echo(f"  3. Install the model: ollama pull {config.model_name}", err=True)
-            typer.echo("\nTo check available models, run: ollama list", err=True)
-            typer.echo("\nNote: Use --toc-only to generate only the table of contents (no LLM required)", err=True)
-            typer.echo("="*70 + "\n", err=True)
-            raise typer.Exit(1)
-        typer.echo("✓ Ollama is available\n", err=False)
+        ollama_check = start_ollama_check(config, use_disk_cache=not force_health_check)
     
-    # Run pipeline
     exit_code = run_pipeline(
         input_path=input_file,
         output_dir=output_path,
@@ -155,6 +222,7 @@ def process(
         plan_only=plan_only,
         no_evaluation=no_evaluation,
         verbose=verbose,
+        ollama_check=ollama_check,
     )
     
     if exit_code != 0:
@@ -239,6 +307,7 @@ def process_batch(
     summary_only: bool = typer.Option(False, "--summary-only", help="Only generate summary (skip planning, evaluation)"),
     plan_only: bool = typer.Option(False, "--plan-only", help="Only generate plan (requires summary generation first, skips evaluation)"),
     no_evaluation: bool = typer.Option(False, "--no-evaluation", help="Generate TOC, summary, and plan but skip evaluation"),
+    force_health_check: bool = typer.Option(False, "--force-health-check", help="Always probe Ollama instead of reusing a successful check from the last 30 seconds"),
 ):
     """Process multiple clinical notes in parallel.
     
@@ -260,13 +329,13 @@ def process_batch(
         python -m app.cli process-batch "*.pdf" --workers 4 --model llama3.2 --verbose
     """
     # Validate mutually exclusive flags
-    flags_set = [toc_only, summary_only, plan_only]
-    if sum(flags_set) > 1:
+    mode_flag_count = toc_only + summary_only + plan_only
+    if mode_flag_count > 1:
         typer.echo("Error: --toc-only, --summary-only, and --plan-only are mutually exclusive.", err=True)
         typer.echo("Please specify only one of these flags.", err=True)
         raise typer.Exit(1)
     
-    if no_evaluation and any(flags_set):
+    if no_evaluation and mode_flag_count:
         typer.echo("Error: --no-evaluation cannot be used with --toc-only, --summary-only, or --plan-only.", err=True)
         raise typer.Exit(1)
     
@@ -277,39 +346,38 @@ def process_batch(
     if "," in input_pattern and "*" not in input_pattern and "?" not in input_pattern:
         # Comma-separated filenames
         filenames = [f.strip() for f in input_pattern.split(",")]
+        # List the search directories once rather than probing per filename
+        file_index = _index_search_bases()
+        missing: list[str] = []
         for filename in filenames:
             file_path = Path(filename)
             
             # If it's just a filename (no directory separators), search for it
-            if "/" not in filename and "\\" not in filename:
-                search_paths = [
-                    Path(filename),  # Current directory
-                    Path("data/archive/mitsamples_pdf") / filename,
-                    Path("data/archive/mtsamples_pdf") / filename,
-                    Path("data/archive/mtsamples_pdf/mtsamples_pdf") / filename,
-                ]
-                
-                for candidate in search_paths:
-                    if candidate.exists() and candidate.is_file():
-                        input_paths.append(candidate.resolve())
-                        break
+            if _is_bare_filename(filename):
+                base_dir = file_index.get(filename)
+                if base_dir is not None:
+                    input_paths.append(_absolute_path(os.path.join(base_dir, filename)))
                 else:
-                    typer.echo(f"Warning: File '{filename}' not found, skipping.", err=True)
-            elif file_path.exists() and file_path.is_file():
-                input_paths.append(file_path.resolve())
+                    missing.append(filename)
+            elif _is_regular_file(file_path):
+                input_paths.append(_absolute_path(file_path))
             else:
-                typer.echo(f"Warning: File '{filename}' not found, skipping.", err=True)
+                missing.append(filename)
+        
+        if missing:
+            # One write for all warnings instead of one echo per missing file
+            sys.stderr.write(
+                f"Warning: {len(missing)} file(s) not found, skipping: {', '.join(missing)}\n"
+            )
+            sys.stderr.flush()
     else:
         # Glob pattern
-        matches = glob.glob(input_pattern, recursive=True)
+        matches = _glob_files(input_pattern)
         if not matches:
             typer.echo(f"Error: No files found matching pattern '{input_pattern}'", err=True)
             raise typer.Exit(1)
         
-        for match in matches:
-            file_path = Path(match)
-            if file_path.is_file():
-                input_paths.append(file_path.resolve())
+        input_paths.extend(_absolute_path(match) for match in matches)
     
     if not input_paths:
         typer.echo("Error: No valid input files found.", err=True)
@@ -318,7 +386,8 @@ def process_batch(
     # Convert output_dir to Path if provided
     output_path = Path(output_dir) if output_dir else None
     
-    # Get or create config
+    # Get or create config (imported lazily: pydantic and dotenv are not needed for --help)
+    from app.config import get_config
     config = get_config()
     if model:
         config.model_name = model
@@ -327,25 +396,19 @@ def process_batch(
     needs_llm = not toc_only  # TOC-only doesn't need LLM
     if needs_llm:
         typer.echo("Checking Ollama availability...", err=False)
-        from app.pipeline import check_ollama_availability
-        is_available, error_msg = check_ollama_availability(config)
+        from app.pipeline import _OLLAMA_ERROR_TEMPLATE, check_ollama_availability
+        is_available, error_msg = check_ollama_availability(config, use_disk_cache=not force_health_check)
         if not is_available:
-            typer.echo("\n" + "="*70, err=True)
-            typer.echo("ERROR: Ollama is not available or model is not installed", err=True)
-            typer.echo("="*70, err=True)
-            typer.echo(f"\n{error_msg}", err=True)
-            typer.echo("\nTo fix this issue:", err=True)
-            typer.echo("  1. Ensure Ollama is installed: https://ollama.ai", err=True)
-            typer.echo("  2. Start Ollama service (if not running)", err=True)
-            typer.echo(f"  3. Install the model: ollama pull {config.model_name}", err=True)
-            typer.echo("\nTo check available models, run: ollama list", err=True)
-            typer.echo("\nNote: Use --toc-only to generate only the table of contents (no LLM required)", err=True)
-            typer.echo("="*70 + "\n", err=True)
+            typer.echo(
+                _OLLAMA_ERROR_TEMPLATE.format(error_msg=error_msg, model_name=config.model_name),
+                err=True,
+            )
             raise typer.Exit(1)
         typer.echo("✓ Ollama is available\n", err=False)
     
     # Run batch pipeline
     typer.echo(f"Processing {len(input_paths)} file(s) with {workers} worker(s)...\n", err=False)
+    from app.pipeline import run_pipeline_batch
     results = run_pipeline_batch(
         input_paths=input_paths,
         output_base_dir=output_path,
@@ -1,13 +1,40 @@
 """Configuration management for the clinical note parser."""
 
+import functools
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
-load_dotenv()
+_dotenv_loaded = False
+
+
+def _find_dotenv_file() -> Optional[Path]:
+    """Find the nearest .env file, searching upwards from this module's directory.
+    
+    This is the same search python-dotenv's load_dotenv() does by default.
+    """
+    module_dir = Path(__file__).resolve().parent
+    for directory in (module_dir, *module_dir.parents):
+        candidate = directory / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _load_dotenv_once() -> None:
+    """Load variables from a .env file on first use rather than at import.
+    
+    python-dotenv is only imported when a .env file exists.
+    """
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        dotenv_path = _find_dotenv_file()
+        if dotenv_path is not None:
+            from dotenv import load_dotenv
+            load_dotenv(dotenv_path)
+        _dotenv_loaded = True
 
 
 class Config(BaseModel):
@@ -19,12 +46,24 @@ class Config(BaseModel):
     chunk_size: int = Field(default=1500, gt=0, description="Target chunk size")
     chunk_overlap: int = Field(default=200, ge=0, description="Overlap between chunks")
     max_paragraph_size: int = Field(default=3000, gt=0, description="Max paragraph size")
+    chunking_workers: int = Field(default=1, ge=1, description="Threads for chunking sections (1 = sequential)")
     min_sections_for_success: int = Field(default=2, ge=1, description="Min sections for success")
     enable_llm_fallback: bool = Field(default=True, description="Enable LLM fallback")
     max_retries: int = Field(default=2, ge=0, description="Max retries for LLM calls")
     max_chunk_failure_rate: float = Field(default=0.3, ge=0.0, le=1.0, description="Max chunk failure rate")
     max_pages_warning: int = Field(default=30, gt=0, description="Page count warning threshold")
     output_dir: Path = Field(default=Path("results"), description="Output directory")
+    health_check_methods: list[str] = Field(
+        default_factory=lambda: ["tags"],
+        description="Ollama API probes run in order by the availability check (version, tags)",
+    )
+
+    # (ollama_base_url, model_name) last verified against Ollama, so batch
+    # workers and per-document LLM clients don't probe the same server and
+    # model again (see ollama_checked)
+    _ollama_checked: Optional[tuple[Optional[str], str]] = PrivateAttr(default=None)
+    # HTTP session for Ollama API calls, created on first use (see session)
+    _session: Optional[Any] = PrivateAttr(default=None)
 
     @field_validator("chunk_overlap")
     @classmethod
@@ -34,6 +73,17 @@ class Config(BaseModel):
             raise ValueError("chunk_overlap must be less than chunk_size")
         return v
 
+    @field_validator("health_check_methods")
+    @classmethod
+    def validate_health_check_methods(cls, v: list[str]) -> list[str]:
+        """Ensure at least one health check method is given and all are known."""
+        if not v:
+            raise ValueError("health_check_methods must name at least one of 'version' or 'tags'")
+        unknown = [m for m in v if m not in ("version", "tags")]
+        if unknown:
+            raise ValueError(f"Unknown health check methods: {', '.join(unknown)} (expected 'version' or 'tags')")
+        return v
+
     @field_validator("output_dir")
     @classmethod
     def validate_output_dir(cls, v: Path) -> Path:
@@ -42,32 +92,81 @@ class Config(BaseModel):
             v = Path(v)
         return v.resolve()
 
+    @property
+    def session(self) -> Any:
+        """Get a pooled requests.Session for Ollama API calls.
+        
+        The session keeps connections to the Ollama server alive, so the
+        availability check and embedding calls after the first one skip the
+        TCP handshake. Copies made with model_copy() share the session.
+        
+        Returns:
+            requests.Session: Session with a pooled HTTP adapter
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    @property
+    def ollama_checked(self) -> bool:
+        """Whether Ollama was verified for the current base URL and model.
+        
+        Copies made with model_copy() keep the recorded pair, so a copy with a
+        different ollama_base_url or model_name is checked again.
+        
+        Returns:
+            bool: True if mark_ollama_checked() was called for these values
+        """
+        return self._ollama_checked == (self.ollama_base_url, self.model_name)
+
+    def mark_ollama_checked(self) -> None:
+        """Record that Ollama and model_name are available at ollama_base_url."""
+        self._ollama_checked = (self.ollama_base_url, self.model_name)
+
     @classmethod
     def from_env(cls) -> "Config":
-        """Create Config instance from environment variables with defaults."""
-        return cls(
-            model_name=os.getenv("CLINICAL_NOTE_MODEL", "qwen2.5:7b"),
-            temperature=float(os.getenv("CLINICAL_NOTE_TEMPERATURE", "0.1")),
-            ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-            chunk_size=int(os.getenv("CLINICAL_NOTE_CHUNK_SIZE", "1500")),
-            chunk_overlap=int(os.getenv("CLINICAL_NOTE_CHUNK_OVERLAP", "200")),
-            max_paragraph_size=int(os.getenv("CLINICAL_NOTE_MAX_PARAGRAPH_SIZE", "3000")),
-            min_sections_for_success=int(os.getenv("CLINICAL_NOTE_MIN_SECTIONS", "2")),
-            enable_llm_fallback=os.getenv("CLINICAL_NOTE_ENABLE_LLM_FALLBACK", "true").lower() in ("true", "1", "yes"),
-            max_retries=int(os.getenv("CLINICAL_NOTE_MAX_RETRIES", "2")),
-            max_chunk_failure_rate=float(os.getenv("CLINICAL_NOTE_MAX_CHUNK_FAILURE_RATE", "0.3")),
-            max_pages_warning=int(os.getenv("CLINICAL_NOTE_MAX_PAGES_WARNING", "30")),
-            output_dir=Path(os.getenv("CLINICAL_NOTE_OUTPUT_DIR", "results")),
-        )
-
-
-_config: Optional[Config] = None
+        """Create Config instance from environment variables with defaults.
+        
+        Raises:
+            ValueError: If an environment value is invalid (pydantic's
+                ValidationError is a ValueError)
+        """
+        _load_dotenv_once()
+        values: dict[str, Any] = {
+            "model_name": os.getenv("CLINICAL_NOTE_MODEL", "qwen2.5:7b"),
+            "temperature": float(os.getenv("CLINICAL_NOTE_TEMPERATURE", "0.1")),
+            "ollama_base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+            "chunk_size": int(os.getenv("CLINICAL_NOTE_CHUNK_SIZE", "1500")),
+            "chunk_overlap": int(os.getenv("CLINICAL_NOTE_CHUNK_OVERLAP", "200")),
+            "max_paragraph_size": int(os.getenv("CLINICAL_NOTE_MAX_PARAGRAPH_SIZE", "3000")),
+            "chunking_workers": int(os.getenv("CLINICAL_NOTE_CHUNKING_WORKERS", "1")),
+            "min_sections_for_success": int(os.getenv("CLINICAL_NOTE_MIN_SECTIONS", "2")),
+            "enable_llm_fallback": os.getenv("CLINICAL_NOTE_ENABLE_LLM_FALLBACK", "true").lower() in ("true", "1", "yes"),
+            "max_retries": int(os.getenv("CLINICAL_NOTE_MAX_RETRIES", "2")),
+            "max_chunk_failure_rate": float(os.getenv("CLINICAL_NOTE_MAX_CHUNK_FAILURE_RATE", "0.3")),
+            "max_pages_warning": int(os.getenv("CLINICAL_NOTE_MAX_PAGES_WARNING", "30")),
+            "output_dir": Path(os.getenv("CLINICAL_NOTE_OUTPUT_DIR", "results")),
+            "health_check_methods": [
+                m.strip() for m in os.getenv("CLINICAL_NOTE_HEALTH_CHECK_METHODS", "tags").split(",") if m.strip()
+            ],
+        }
+        
+        return cls(**values)
 
 
+@functools.cache
 def get_config() -> Config:
-    """Get the global configuration instance."""
-    global _config
-    if _config is None:
-        _config = Config.from_env()
-    return _config
+    """Get the global configuration instance.
+    
+    The instance is created from the environment on first call; use
+    get_config.cache_clear() to re-read the environment.
+    """
+    return Config.from_env()
 
@@ -1,12 +1,17 @@
 """Evaluation metrics for summary and plan quality."""
 
+import functools
+import itertools
 import json
 import logging
 import os
 import re
 import statistics
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 try:
     import requests
@@ -14,6 +19,12 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     import numpy as np
     NUMPY_AVAILABLE = True
@@ -32,8 +43,44 @@ logger = logging.getLogger(__name__)
 # This ensures environment variables are set before any Ollama API calls
 _configure_mps_for_ollama()
 
+# Citation formats, tried in order by parse_citation_from_text
+_NEW_FORMAT_CITATION_RE = re.compile(r'^\[?([A-Z][A-Z\s\-\-]+?)\]?\s+section,\s+chunk_(\d+)(?::(\d+)-(\d+))?')
+_SECTION_RE = re.compile(r'^([A-Z][A-Z\s]+?)(?:\s+section)?[,\(]')
+_CHUNK_SPAN_RE = re.compile(r'chunk_(\d+)(?::(\d+)-(\d+))?')
+_CHUNK_RE = re.compile(r'chunk_(\d+)')
+# Worker threads for per-text embedding requests when batch embedding is unavailable
+_EMBEDDING_FALLBACK_WORKERS = 8
+# Texts per /api/embed request; each request keeps the 30 s timeout of a single
+# embedding, and a failed request is retried per text for that batch only
+_EMBEDDING_BATCH_SIZE = 32
+# Pairwise Jaccard matrix entries computed per block (bounds memory for large citation counts)
+_JACCARD_BLOCK_ELEMENTS = 1 << 20
+# Most recent embeddings kept per (base_url, model, text), so repeatedly cited chunks are
+# embedded once; the server is part of the key since models of the same name may differ
+_EMBEDDING_CACHE_SIZE = 512
+_embedding_cache: "OrderedDict[Tuple[str, str, str], List[float]]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+# Leading marker of a stripped plan.txt line; the matched group names the line kind
+_PLAN_LINE_RE = re.compile(
+    r'(?P<category>\*\*\d+\.\s+\w+\*\*)'  # "**1. Diagnostics**", "**2. Therapeutics**", etc.
+    r'|(?P<recommendation>\[Recommendation)'  # "[Recommendation X]"
+    r'|(?P<source>- Source:)'
+    r'|(?P<confidence>- Confidence:)'
+    r'|(?P<metadata>- )'  # Risks/Benefits, Hallucination Guard Note, ...
+    r'|(?P<text>\*)'  # Recommendation text
+)
+
+
+class ParsedCitation(NamedTuple):
+    """Chunk reference parsed from a citation string."""
+    
+    chunk_id: str
+    start_char: Optional[int]
+    end_char: Optional[int]
+    section_name: Optional[str]
+
 
-def parse_citation_from_text(citation_text: str) -> Optional[Tuple[str, Optional[int], Optional[int], Optional[str]]]:
+def parse_citation_from_text(citation_text: str) -> Optional[ParsedCitation]:
     """Parse citation from text format.
     
     Handles formats like:
@@ -49,47 +96,66 @@ def parse_citation_from_text(citation_text: str) -> Optional[Tuple[str, Optional
         citation_text: Citation text to parse
         
     Returns:
-        Optional[Tuple[str, Optional[int], Optional[int], Optional[str]]]: 
-            (chunk_id, start_char, end_char, section_name) or None
+        Optional[ParsedCitation]: (chunk_id, start_char, end_char, section_name) or None
     """
-    citation_text = citation_text.strip()
+    return _parse_citation_cached(citation_text.strip())
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_citation_cached(citation_text: str) -> Optional[ParsedCitation]:
+    """Parse an already-stripped citation string.
+    
+    The same citation strings recur across coverage, span and semantic checks,
+    so results are memoized.
     
+    Args:
+        citation_text: Stripped citation text to parse
+        
+    Returns:
+        Optional[ParsedCitation]: (chunk_id, start_char, end_char, section_name) or None
+    """
     # Handle "None mentioned" or empty
     if not citation_text or "none" in citation_text.lower():
         return None
     
+    # Every supported format references a chunk; skip the regexes when none is cited
+    if "chunk_" not in citation_text:
+        return None
+    
     # Extract section name if present (before chunk reference)
     # Patterns: "SECTION_NAME section, chunk_X:Y-Z" or "[SECTION_NAME] section, chunk_X:Y-Z" (new format)
     #           "SECTION_NAME, chunk_X", "SECTION_NAME section, chunk_X", "SECTION_NAME (chunk_X)" (old formats)
     section_name = None
     # Try new format first: "SECTION_NAME section, chunk_X:Y-Z" or "[SECTION_NAME] section, chunk_X:Y-Z"
     # Accept brackets around section name: [SECTION_NAME] or just SECTION_NAME
-    new_format_match = re.match(r'^\[?([A-Z][A-Z\s\-\-]+?)\]?\s+section,\s+chunk_(\d+)(?::(\d+)-(\d+))?', citation_text)
+    new_format_match = _NEW_FORMAT_CITATION_RE.match(citation_text)
     if new_format_match:
         section_name = new_format_match.group(1).strip()
         chunk_id = f"chunk_{new_format_match.group(2)}"
         start_char = int(new_format_match.group(3)) if new_format_match.group(3) else None
         end_char = int(new_format_match.group(4)) if new_format_match.group(4) else None
-        return (chunk_id, start_char, end_char, section_name)
+        return ParsedCitation(chunk_id, start_char, end_char, section_name)
     
     # Try old formats: "SECTION_NAME, chunk_X", "SECTION_NAME section, chunk_X", "SECTION_NAME (chunk_X)"
-    section_match = re.search(r'^([A-Z][A-Z\s]+?)(?:\s+section)?[,\(]', citation_text)
-    if section_match:
-        section_name = section_match.group(1).strip()
+    # The section name is always followed by "," or "(", so plain "chunk_X" citations skip the regex
+    if "," in citation_text or "(" in citation_text:
+        section_match = _SECTION_RE.search(citation_text)
+        if section_match:
+            section_name = section_match.group(1).strip()
     
     # Try to extract chunk ID and character spans: "chunk_0:123-456"
-    chunk_span_match = re.search(r'chunk_(\d+)(?::(\d+)-(\d+))?', citation_text)
+    chunk_span_match = _CHUNK_SPAN_RE.search(citation_text)
     if chunk_span_match:
         chunk_id = f"chunk_{chunk_span_match.group(1)}"
         start_char = int(chunk_span_match.group(2)) if chunk_span_match.group(2) else None
         end_char = int(chunk_span_match.group(3)) if chunk_span_match.group(3) else None
-        return (chunk_id, start_char, end_char, section_name)
+        return ParsedCitation(chunk_id, start_char, end_char, section_name)
     
     # Try to extract just chunk ID: "chunk_0" or "chunk_5"
-    chunk_match = re.search(r'chunk_(\d+)', citation_text)
+    chunk_match = _CHUNK_RE.search(citation_text)
     if chunk_match:
         chunk_id = f"chunk_{chunk_match.group(1)}"
-        return (chunk_id, None, None, section_name)
+        return ParsedCitation(chunk_id, None, None, section_name)
     
     return None
 
@@ -103,8 +169,6 @@ def extract_items_from_structured_summary(structured_summary: StructuredSummary)
     Returns:
         List[Dict]: List of items with text and source information
     """
-    items = []
-    
     # Extract items from all sections
     sections = [
         structured_summary.patient_snapshot,
@@ -116,14 +180,10 @@ def extract_items_from_structured_summary(structured_summary: StructuredSummary)
         structured_summary.assessment,
     ]
     
-    for section_items in sections:
-        for item in section_items:
-            items.append({
-                "text": item.text,
-                "source": item.source,
-            })
-    
-    return items
+    return [
+        {"text": item.text, "source": item.source}
+        for item in itertools.chain.from_iterable(sections)
+    ]
 
 
 def extract_items_from_summary(summary_text: str) -> List[Dict]:
@@ -136,45 +196,18 @@ def extract_items_from_summary(summary_text: str) -> List[Dict]:
         List[Dict]: List of items with text and source information
     """
     items = []
-    lines = summary_text.split("\n")
-    
     current_section = None
     current_item_lines = []
     
-    for line in lines:
+    for line in summary_text.split("\n"):
         stripped = line.strip()
         
-        # Check for section headers
-        if stripped.startswith("**") and stripped.endswith("**"):
-            # Save previous item if exists
+        if not stripped:
+            # Empty line - keep it as part of the item (for formatting)
             if current_item_lines:
-                # Try to find source in the last few lines
-                item_text_lines = []
-                source_text = None
-                for i, item_line in enumerate(current_item_lines):
-                    if item_line.strip().startswith("- Source:"):
-                        source_text = item_line.strip().replace("- Source:", "").strip()
-                        # All lines before this are item text
-                        item_text_lines = current_item_lines[:i]
-                        break
-                
-                if item_text_lines:
-                    item_text = "\n".join(item_text_lines).strip()
-                    if item_text:
-                        items.append({
-                            "text": item_text,
-                            "section": current_section,
-                            "source": source_text,
-                        })
-            
-            current_section = stripped.strip("*").strip()
-            current_item_lines = []
-            continue
-        
-        # Accumulate lines until we hit a source line
-        if stripped.startswith("- Source:"):
+                current_item_lines.append("")
+        elif stripped.startswith("- Source:"):
             # This is the source for the current item
-            source_text = stripped.replace("- Source:", "").strip()
             if current_item_lines:
                 # All previous lines are the item text
                 item_text = "\n".join(current_item_lines).strip()
@@ -182,37 +215,15 @@ def extract_items_from_summary(summary_text: str) -> List[Dict]:
                     items.append({
                         "text": item_text,
                         "section": current_section,
-                        "source": source_text,
+                        "source": stripped.replace("- Source:", "").strip(),
                     })
                 current_item_lines = []
-        elif stripped:  # Non-empty line
+        elif stripped.startswith("**") and stripped.endswith("**"):
+            # Section header; text without a source line is dropped
+            current_section = stripped.strip("*").strip()
+            current_item_lines = []
+        else:
             current_item_lines.append(line)  # Keep original line (with indentation)
-        elif not stripped and current_item_lines:
-            # Empty line - keep it as part of the item (for formatting)
-            current_item_lines.append("")
-    
-    # Handle last item if exists
-    if current_item_lines:
-        item_text_lines = []
-        source_text = None
-        for i, item_line in enumerate(current_item_lines):
-            if item_line.strip().startswith("- Source:"):
-                source_text = item_line.strip().replace("- Source:", "").strip()
-                item_text_lines = current_item_lines[:i]
-                break
-        
-        if not source_text and item_text_lines:
-            # No source found, use all lines as text
-            item_text_lines = current_item_lines
-        
-        if item_text_lines:
-            item_text = "\n".join(item_text_lines).strip()
-            if item_text:
-                items.append({
-                    "text": item_text,
-                    "section": current_section,
-                    "source": source_text,
-                })
     
     return items
 
@@ -254,25 +265,31 @@ def extract_recommendations_from_plan(plan_text: str) -> List[Dict]:
     
     current_category = None
     current_rec = None
+    # Text of the current recommendation, joined when it is saved
+    text_parts = []
+    has_text = False
     collecting_text = False
     
     for line in lines:
         stripped = line.strip()
+        if not stripped:
+            continue
         
-        # Check for category headers: "**1. Diagnostics**", "**2. Therapeutics**", etc.
-        if re.match(r'\*\*\d+\.\s+\w+\*\*', stripped):
+        match = _PLAN_LINE_RE.match(stripped)
+        kind = match.lastgroup if match else None
+        
+        if kind == "category":
             current_category = stripped.strip("*").strip()
             # Save previous recommendation if exists
             if current_rec:
+                current_rec["text"] = "".join(text_parts)
                 recommendations.append(current_rec)
             current_rec = None
             collecting_text = False
-            continue
-        
-        # Check for recommendation start: "[Recommendation X]"
-        if stripped.startswith("[Recommendation"):
+        elif kind == "recommendation":
             # Save previous recommendation if exists
             if current_rec:
+                current_rec["text"] = "".join(text_parts)
                 recommendations.append(current_rec)
             current_rec = {
                 "text": "",
@@ -280,21 +297,17 @@ def extract_recommendations_from_plan(plan_text: str) -> List[Dict]:
                 "source": None,
                 "confidence": None,
             }
+            text_parts = []
+            has_text = False
             collecting_text = False
-            continue
-        
-        # Check for source line: "- Source: ..."
-        if stripped.startswith("- Source:"):
+        elif kind == "source":
             source_text = stripped.replace("- Source:", "").strip()
             # Remove backticks if present
             source_text = source_text.strip("`")
             if current_rec:
                 current_rec["source"] = source_text
             collecting_text = False
-            continue
-        
-        # Check for confidence line: "- Confidence: ..."
-        if stripped.startswith("- Confidence:"):
+        elif kind == "confidence":
             conf_text = stripped.replace("- Confidence:", "").strip()
             try:
                 if current_rec:
@@ -302,27 +315,21 @@ def extract_recommendations_from_plan(plan_text: str) -> List[Dict]:
             except ValueError:
                 pass
             collecting_text = False
-            continue
-        
-        # Check for other metadata lines (Risks/Benefits, Hallucination Guard Note)
-        if stripped.startswith("- ") and current_rec:
+        elif kind == "metadata" and current_rec:
             collecting_text = False
-            continue
-        
-        # Check for recommendation text (starts with "*")
-        if stripped.startswith("*") and current_rec:
+        elif kind == "text" and current_rec:
             rec_text = stripped.lstrip("*").strip()
-            if current_rec["text"]:
-                current_rec["text"] += "\n" + rec_text
-            else:
-                current_rec["text"] = rec_text
+            text_parts.append("\n" + rec_text if has_text else rec_text)
+            has_text = has_text or bool(rec_text)
             collecting_text = True
-        elif collecting_text and stripped and current_rec:
+        elif collecting_text and current_rec:
             # Continuation of recommendation text (shouldn't happen with current format, but handle it)
-            current_rec["text"] += " " + stripped
+            text_parts.append(" " + stripped)
+            has_text = True
     
     # Add last recommendation if it exists
     if current_rec:
+        current_rec["text"] = "".join(text_parts)
         recommendations.append(current_rec)
     
     return recommendations
@@ -346,16 +353,7 @@ def validate_citation_span(
     if start_char is None or end_char is None:
         return True  # Can't validate without positions
     
-    if start_char < 0 or end_char < 0:
-        return False
-    
-    if start_char >= end_char:
-        return False
-    
-    if end_char > text_length:
-        return False
-    
-    return True
+    return 0 <= start_char < end_char <= text_length
 
 
 def validate_section_name(
@@ -401,19 +399,8 @@ def validate_span_within_chunk(
     if start_char is None or end_char is None:
         return True  # Can't validate without positions
     
-    chunk_length = chunk_end_char - chunk_start_char
-    
     # Spans are local to chunk, so they should be within [0, chunk_length]
-    if start_char < 0 or end_char < 0:
-        return False
-    
-    if start_char >= end_char:
-        return False
-    
-    if end_char > chunk_length:
-        return False
-    
-    return True
+    return 0 <= start_char < end_char <= chunk_end_char - chunk_start_char
 
 
 def calculate_jaccard_similarity(span1: Tuple[int, int], span2: Tuple[int, int]) -> float:
@@ -429,9 +416,11 @@ def calculate_jaccard_similarity(span1: Tuple[int, int], span2: Tuple[int, int])
     start1, end1 = span1
     start2, end2 = span2
     
+    # Conditional expressions instead of max()/min(): this runs once per citation pair
+    # when numpy is unavailable, and avoids a builtin call per bound
     # Calculate intersection
-    intersection_start = max(start1, start2)
-    intersection_end = min(end1, end2)
+    intersection_start = start1 if start1 > start2 else start2
+    intersection_end = end1 if end1 < end2 else end2
     
     if intersection_start >= intersection_end:
         return 0.0
@@ -439,8 +428,8 @@ def calculate_jaccard_similarity(span1: Tuple[int, int], span2: Tuple[int, int])
     intersection = intersection_end - intersection_start
     
     # Calculate union
-    union_start = min(start1, start2)
-    union_end = max(end1, end2)
+    union_start = start1 if start1 < start2 else start2
+    union_end = end1 if end1 > end2 else end2
     union = union_end - union_start
     
     if union == 0:
@@ -449,7 +438,78 @@ def calculate_jaccard_similarity(span1: Tuple[int, int], span2: Tuple[int, int])
     return intersection / union
 
 
-def _get_ollama_embedding(text: str, model: str = "nomic-embed-text", base_url: str = "http://127.0.0.1:11434") -> Optional[List[float]]:
+def _pairwise_jaccard_stats(spans: List[Tuple[int, int]]) -> Tuple[int, float, Optional[float], Optional[float]]:
+    """Summarize Jaccard similarity over every pair of citation spans.
+    
+    Pairs are scored as in calculate_jaccard_similarity. With numpy, rows of the
+    pairwise matrix are computed in bounded blocks and folded into running totals,
+    so memory stays flat however many citations there are.
+    
+    Args:
+        spans: (start_char, end_char) for each citation
+        
+    Returns:
+        Tuple[int, float, Optional[float], Optional[float]]:
+            (number of pairs, average, min, max); average is 0.0 and min/max are None without pairs
+    """
+    n = len(spans)
+    if n < 2:
+        return 0, 0.0, None, None
+    
+    if not NUMPY_AVAILABLE:
+        scores = [
+            calculate_jaccard_similarity(spans[i], spans[j])
+            for i in range(n)
+            for j in range(i + 1, n)
+        ]
+        return len(scores), sum(scores) / len(scores), min(scores), max(scores)
+    
+    span_array = np.asarray(spans, dtype=np.int64)
+    starts, ends = span_array[:, 0], span_array[:, 1]
+    rows_per_block = max(1, _JACCARD_BLOCK_ELEMENTS // n)
+    
+    pair_count = 0
+    total = 0.0
+    lowest = np.inf
+    highest = -np.inf
+    for row_start in range(0, n - 1, rows_per_block):
+        row_end = min(row_start + rows_per_block, n - 1)
+        # Rows [row_start, row_end) against columns (row_start, n), keeping only column > row
+        row_starts = starts[row_start:row_end, None]
+        row_ends = ends[row_start:row_end, None]
+        col_starts = starts[None, row_start + 1:]
+        col_ends = ends[None, row_start + 1:]
+        upper = (
+            np.arange(row_start + 1, n)[None, :] > np.arange(row_start, row_end)[:, None]
+        )
+        
+        intersection = np.minimum(row_ends, col_ends) - np.maximum(row_starts, col_starts)
+        union = np.maximum(row_ends, col_ends) - np.minimum(row_starts, col_starts)
+        scores = np.zeros(intersection.shape, dtype=np.float64)
+        np.divide(intersection, union, out=scores, where=intersection > 0)
+        scores = scores[upper]
+        
+        pair_count += scores.size
+        total += float(scores.sum())
+        lowest = min(lowest, float(scores.min()))
+        highest = max(highest, float(scores.max()))
+    
+    return pair_count, total / pair_count, lowest, highest
+
+
+def _loads_json(content: bytes) -> Any:
+    """Parse a JSON response body, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _get_ollama_embedding(
+    text: str,
+    model: str = "nomic-embed-text",
+    base_url: str = "http://127.0.0.1:11434",
+    session: Optional[Any] = None,
+) -> Optional[List[float]]:
     """Get embedding for text using Ollama embeddings API.
     
     Note: MPS/GPU acceleration is automatically used by Ollama if configured.
@@ -460,6 +520,7 @@ def _get_ollama_embedding(text: str, model: str = "nomic-embed-text", base_url:
         text: Text to embed
         model: Ollama embedding model name (default: "nomic-embed-text")
         base_url: Ollama API base URL (default: "http://127.0.0.1:11434")
+        session: requests.Session to reuse connections (default: the global config's pooled session)
         
     Returns:
         List of floats representing the embedding, or None if failed
@@ -469,19 +530,156 @@ def _get_ollama_embedding(text: str, model: str = "nomic-embed-text", base_url:
         return None
     
     try:
-        response = requests.post(
+        response = (session or get_config().session).post(
             f"{base_url}/api/embeddings",
             json={"model": model, "prompt": text},
             timeout=30,
         )
         response.raise_for_status()
-        data = response.json()
+        data = _loads_json(response.content)
         return data.get("embedding")
     except Exception as e:
         logger.warning(f"Failed to get embedding from Ollama: {e}")
         return None
 
 
+def _request_embedding_batch(
+    texts: List[str],
+    model: str,
+    base_url: str,
+    session: Any,
+) -> Tuple[Optional[List[List[float]]], bool]:
+    """Embed texts with one request to the batch /api/embed endpoint.
+    
+    Args:
+        texts: Texts to embed (at most _EMBEDDING_BATCH_SIZE)
+        model: Ollama embedding model name
+        base_url: Ollama API base URL
+        session: requests.Session to reuse connections
+        
+    Returns:
+        Tuple of (embeddings in the same order as texts or None if the request
+        failed, whether the server lacks the batch endpoint)
+    """
+    try:
+        response = session.post(
+            f"{base_url}/api/embed",
+            json={"model": model, "input": texts},
+            timeout=30,
+        )
+        if response.status_code == 404:
+            logger.debug("Batch embedding endpoint not available, embedding texts individually")
+            return None, True
+        response.raise_for_status()
+        embeddings = _loads_json(response.content).get("embeddings")
+        if embeddings is not None and len(embeddings) == len(texts):
+            return embeddings, False
+        logger.debug("Batch embedding response did not match request, embedding texts individually")
+    except Exception as e:
+        logger.debug(f"Batch embedding request failed ({e}), embedding texts individually")
+    return None, False
+
+
+def _request_embeddings(
+    texts: List[str],
+    model: str = "nomic-embed-text",
+    base_url: str = "http://127.0.0.1:11434",
+    session: Optional[Any] = None,
+) -> List[Optional[List[float]]]:
+    """Request embeddings for several texts, batching them through Ollama's /api/embed.
+    
+    Texts are posted in batches of _EMBEDDING_BATCH_SIZE. A batch that fails
+    is retried with concurrent per-text /api/embeddings calls; older Ollama
+    servers without the batch endpoint use per-text calls throughout.
+    
+    Args:
+        texts: Texts to embed
+        model: Ollama embedding model name (default: "nomic-embed-text")
+        base_url: Ollama API base URL (default: "http://127.0.0.1:11434")
+        session: requests.Session to reuse connections (default: the global config's pooled session)
+        
+    Returns:
+        List of embeddings in the same order as texts (None for any that failed)
+    """
+    if not REQUESTS_AVAILABLE:
+        logger.warning("requests library not available. Install with: pip install requests")
+        return [None] * len(texts)
+    
+    if session is None:
+        session = get_config().session
+    
+    embeddings: List[Optional[List[float]]] = []
+    failed: List[int] = []
+    batch_endpoint = True
+    for start in range(0, len(texts), _EMBEDDING_BATCH_SIZE):
+        batch = texts[start:start + _EMBEDDING_BATCH_SIZE]
+        batch_embeddings = None
+        if batch_endpoint:
+            batch_embeddings, unsupported = _request_embedding_batch(batch, model, base_url, session)
+            batch_endpoint = not unsupported
+        if batch_embeddings is None:
+            failed.extend(range(start, start + len(batch)))
+            batch_embeddings = [None] * len(batch)
+        embeddings.extend(batch_embeddings)
+    
+    if failed:
+        with ThreadPoolExecutor(max_workers=min(_EMBEDDING_FALLBACK_WORKERS, len(failed))) as executor:
+            retried = executor.map(
+                lambda i: _get_ollama_embedding(texts[i], model=model, base_url=base_url, session=session),
+                failed,
+            )
+            for i, embedding in zip(failed, retried):
+                embeddings[i] = embedding
+    return embeddings
+
+
+def _get_ollama_embeddings_batch(
+    texts: List[str],
+    model: str = "nomic-embed-text",
+    base_url: str = "http://127.0.0.1:11434",
+    session: Optional[Any] = None,
+) -> List[Optional[List[float]]]:
+    """Get embeddings for several texts, reusing cached embeddings where possible.
+    
+    Duplicate texts are embedded once, and embeddings are cached per
+    (base_url, model, text) so chunks cited by several recommendations or
+    evaluations skip the request.
+    
+    Args:
+        texts: Texts to embed
+        model: Ollama embedding model name (default: "nomic-embed-text")
+        base_url: Ollama API base URL (default: "http://127.0.0.1:11434")
+        session: requests.Session to reuse connections (default: the global config's pooled session)
+        
+    Returns:
+        List of embeddings in the same order as texts (None for any that failed)
+    """
+    if not texts:
+        return []
+    
+    unique_texts = list(dict.fromkeys(texts))
+    embeddings = {}
+    with _embedding_cache_lock:
+        for text in unique_texts:
+            key = (base_url, model, text)
+            if key in _embedding_cache:
+                _embedding_cache.move_to_end(key)
+                embeddings[text] = _embedding_cache[key]
+    
+    missing = [text for text in unique_texts if text not in embeddings]
+    if missing:
+        fetched = _request_embeddings(missing, model=model, base_url=base_url, session=session)
+        with _embedding_cache_lock:
+            for text, embedding in zip(missing, fetched):
+                embeddings[text] = embedding
+                if embedding is not None:
+                    _embedding_cache[(base_url, model, text)] = embedding
+            while len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+    
+    return [embeddings[text] for text in texts]
+
+
 def evaluate_semantic_accuracy(
     structured_plan: StructuredPlan,
     chunks: List,
@@ -521,6 +719,8 @@ def evaluate_semantic_accuracy(
     
     # Use default Ollama base URL (can be overridden via environment variable if needed)
     base_url = os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434")
+    # Reuse pooled connections for the embedding calls below
+    session = config.session
     
     # Create chunk mapping
     chunk_map = {chunk.chunk_id: chunk for chunk in chunks}
@@ -539,9 +739,8 @@ def evaluate_semantic_accuracy(
             "per_recommendation": [],
         }
     
-    per_recommendation = []
-    similarity_scores = []
-    
+    # Resolve cited text for each recommendation before embedding
+    candidates = []
     for rec in plan_recs_with_source:
         rec_text = rec.get("text", "")
         citation_info = parse_citation_from_text(rec.get("source", ""))
@@ -552,12 +751,11 @@ def evaluate_semantic_accuracy(
         
         chunk_id, start_char, end_char, _ = citation_info
         
-        if chunk_id not in chunk_map:
+        chunk = chunk_map.get(chunk_id)
+        if chunk is None:
             # Chunk doesn't exist, skip
             continue
         
-        chunk = chunk_map[chunk_id]
-        
         # Extract cited text
         if start_char is not None and end_char is not None:
             # Use specific span (spans are global)
@@ -577,42 +775,74 @@ def evaluate_semantic_accuracy(
             # Empty cited text, skip
             continue
         
-        # Compute semantic similarity
+        candidates.append((rec, rec_text, chunk_id, cited_text))
+    
+    # Embed all recommendation and cited texts in one request
+    embeddings = _get_ollama_embeddings_batch(
+        [rec_text for _, rec_text, _, _ in candidates] + [cited_text for _, _, _, cited_text in candidates],
+        model=embedding_model,
+        base_url=base_url,
+        session=session,
+    )
+    rec_embeddings = embeddings[:len(candidates)]
+    cited_embeddings = embeddings[len(candidates):]
+    
+    embedded = []
+    for candidate, rec_embedding, cited_embedding in zip(candidates, rec_embeddings, cited_embeddings):
+        number = candidate[0].get('number')
+        if rec_embedding is None or cited_embedding is None:
+            logger.warning(f"Failed to get embeddings for recommendation {number}, skipping")
+            continue
         try:
-            # Get embeddings from Ollama
-            rec_embedding = _get_ollama_embedding(rec_text, model=embedding_model, base_url=base_url)
-            cited_embedding = _get_ollama_embedding(cited_text, model=embedding_model, base_url=base_url)
-            
-            if rec_embedding is None or cited_embedding is None:
-                logger.warning(f"Failed to get embeddings for recommendation {rec.get('number')}, skipping")
-                continue
-            
-            # Convert to numpy arrays for computation
-            rec_vec = np.array(rec_embedding)
-            cited_vec = np.array(cited_embedding)
-            
-            # Compute cosine similarity
-            similarity = float(np.dot(rec_vec, cited_vec) / 
-                             (np.linalg.norm(rec_vec) * np.linalg.norm(cited_vec)))
-            
-            similarity_scores.append(similarity)
-            is_supported = similarity >= similarity_threshold
-            
-            per_recommendation.append({
-                "number": rec.get("number"),
-                "similarity_score": round(similarity, 4),
-                "is_supported": is_supported,
-                "cited_chunk_id": chunk_id,
-                "cited_text_preview": cited_text[:100] + "..." if len(cited_text) > 100 else cited_text,
-            })
-        except Exception as e:
-            logger.warning(f"Failed to compute similarity for recommendation {rec.get('number')}: {e}")
+            rec_vec = np.asarray(rec_embedding, dtype=np.float32)
+            cited_vec = np.asarray(cited_embedding, dtype=np.float32)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Failed to compute similarity for recommendation {number}: {e}")
             continue
+        expected_shape = embedded[0][1].shape if embedded else rec_vec.shape
+        if rec_vec.ndim != 1 or rec_vec.shape != cited_vec.shape or rec_vec.shape != expected_shape:
+            logger.warning(f"Mismatched embedding dimensions for recommendation {number}, skipping")
+            continue
+        embedded.append((candidate, rec_vec, cited_vec))
+    
+    # Compute cosine similarity for all pairs at once on row-normalized matrices
+    similarities = np.empty(0, dtype=np.float32)
+    if embedded:
+        rec_matrix = np.stack([rec_vec for _, rec_vec, _ in embedded])
+        cited_matrix = np.stack([cited_vec for _, _, cited_vec in embedded])
+        rec_norms = np.linalg.norm(rec_matrix, axis=1)
+        cited_norms = np.linalg.norm(cited_matrix, axis=1)
+        # Cosine similarity is undefined for zero vectors; those pairs are skipped
+        nonzero = (rec_norms > 0) & (cited_norms > 0)
+        if not nonzero.all():
+            for (candidate, _, _), has_norm in zip(embedded, nonzero.tolist()):
+                if not has_norm:
+                    logger.warning(f"Zero embedding for recommendation {candidate[0].get('number')}, skipping")
+            embedded = [item for item, has_norm in zip(embedded, nonzero.tolist()) if has_norm]
+            rec_matrix, rec_norms = rec_matrix[nonzero], rec_norms[nonzero]
+            cited_matrix, cited_norms = cited_matrix[nonzero], cited_norms[nonzero]
+        similarities = np.einsum(
+            'ij,ij->i', rec_matrix / rec_norms[:, None], cited_matrix / cited_norms[:, None]
+        )
+    supported = similarities >= similarity_threshold
+    
+    per_recommendation = [
+        {
+            "number": rec.get("number"),
+            "similarity_score": round(similarity, 4),
+            "is_supported": is_supported,
+            "cited_chunk_id": chunk_id,
+            "cited_text_preview": cited_text[:100] + "..." if len(cited_text) > 100 else cited_text,
+        }
+        for ((rec, _, chunk_id, cited_text), _, _), similarity, is_supported in zip(
+            embedded, similarities.tolist(), supported.tolist()
+        )
+    ]
     
     # Compute aggregate metrics
-    well_supported = sum(1 for item in per_recommendation if item["is_supported"])
+    well_supported = int(np.count_nonzero(supported))
     poorly_supported = len(per_recommendation) - well_supported
-    average_similarity = sum(similarity_scores) / len(similarity_scores) if similarity_scores else None
+    average_similarity = float(similarities.mean(dtype=np.float64)) if similarities.size else None
     support_rate = well_supported / len(per_recommendation) if per_recommendation else None
     
     return {
@@ -626,6 +856,73 @@ def evaluate_semantic_accuracy(
     }
 
 
+def _scan_citations(
+    citations: List[Tuple[Dict, Optional[ParsedCitation]]],
+    chunk_map: Dict,
+    text_length: int,
+) -> Dict:
+    """Check parsed citations and collect their spans in a single pass.
+    
+    Citations that could not be parsed are not counted. Spans in citations are
+    GLOBAL, not local to the chunk.
+    
+    Args:
+        citations: (item, citation_info) pairs from parse_citation_from_text
+        chunk_map: Mapping of chunk_id to Chunk
+        text_length: Length of the canonical note text
+        
+    Returns:
+        Dict: Counts of checked/invalid citations and spans outside their chunk,
+            span-consistency counts, and the cited spans for Jaccard overlap
+    """
+    checked = 0
+    invalid = 0
+    span_out_of_bounds = 0
+    consistency_passed = 0
+    spans = []
+    
+    for _, citation_info in citations:
+        if not citation_info:
+            continue
+        chunk_id, start_char, end_char, _ = citation_info
+        checked += 1
+        
+        chunk = chunk_map.get(chunk_id)
+        if chunk is None:
+            # Chunk doesn't exist
+            invalid += 1
+            continue
+        
+        chunk_start = chunk.start_char
+        chunk_end = chunk.end_char
+        if start_char is not None and end_char is not None:
+            # Validate spans are within chunk's global bounds, and against global text length
+            out_of_chunk = start_char < chunk_start or end_char > chunk_end
+            if out_of_chunk:
+                span_out_of_bounds += 1
+            if out_of_chunk or not validate_citation_span(start_char, end_char, text_length):
+                invalid += 1
+            spans.append((start_char, end_char))
+        else:
+            # Validate chunk bounds, and use the entire chunk span for overlap
+            if chunk_start < 0 or chunk_end > text_length:
+                invalid += 1
+            spans.append((chunk_start, chunk_end))
+        
+        # Span consistency: the cited chunk has text
+        if chunk.text:
+            consistency_passed += 1
+    
+    return {
+        "checked": checked,
+        "invalid": invalid,
+        "span_out_of_bounds": span_out_of_bounds,
+        "consistency_checks": len(spans),
+        "consistency_passed": consistency_passed,
+        "spans": spans,
+    }
+
+
 def evaluate_summary_and_plan(
     structured_summary: StructuredSummary,
     structured_plan: StructuredPlan,
@@ -681,84 +978,27 @@ def evaluate_summary_and_plan(
         if (summary_items or plan_recommendations) else 0.0
     )
     
-    # Citation Validity
-    invalid_citations = 0
-    total_citations = 0
+    # Parse each citation once; validity, Jaccard spans and span consistency are gathered in one scan
+    summary_citations = [
+        (item, parse_citation_from_text(item.get("source", "")))
+        for item in summary_items_with_source
+    ]
+    plan_citations = [
+        (rec, parse_citation_from_text(rec.get("source", "")))
+        for rec in plan_recs_with_source
+    ]
     
-    # Track new validation metrics separately for summary and plan
+    # Citation Validity
     # Note: Section name mismatches are no longer tracked since citations only use chunk_id (no section titles)
     summary_section_mismatches = 0
-    summary_span_out_of_bounds = 0
     plan_section_mismatches = 0
-    plan_span_out_of_bounds = 0
-    
-    for item in summary_items_with_source:
-        citation_info = parse_citation_from_text(item.get("source", ""))
-        if citation_info:
-            chunk_id, start_char, end_char, section_name = citation_info
-            total_citations += 1
-            citation_invalid = False
-            
-            if chunk_id in chunk_map:
-                chunk = chunk_map[chunk_id]
-                
-                # Note: Section name validation is no longer performed since citations only use chunk_id
-                # Citations now use format: "chunk_id:start_char-end_char" (no section title)
-                
-                # Validate span bounds within chunk if spans provided
-                # Note: spans in citations are GLOBAL, not local to chunk
-                if start_char is not None and end_char is not None:
-                    # Validate spans are within chunk's global bounds
-                    if start_char < chunk.start_char or end_char > chunk.end_char:
-                        summary_span_out_of_bounds += 1
-                        citation_invalid = True
-                    # Also validate against global text length
-                    if not validate_citation_span(start_char, end_char, text_length):
-                        citation_invalid = True
-                else:
-                    # Validate chunk bounds
-                    if chunk.start_char < 0 or chunk.end_char > text_length:
-                        citation_invalid = True
-            else:
-                # Chunk doesn't exist
-                citation_invalid = True
-            
-            if citation_invalid:
-                invalid_citations += 1
     
-    for rec in plan_recs_with_source:
-        citation_info = parse_citation_from_text(rec.get("source", ""))
-        if citation_info:
-            chunk_id, start_char, end_char, section_name = citation_info
-            total_citations += 1
-            citation_invalid = False
-            
-            if chunk_id in chunk_map:
-                chunk = chunk_map[chunk_id]
-                
-                # Note: Section name validation is no longer performed since citations only use chunk_id
-                # Citations now use format: "chunk_id:start_char-end_char" (no section title)
-                
-                # Validate span bounds within chunk if spans provided
-                # Note: spans in citations are GLOBAL, not local to chunk
-                if start_char is not None and end_char is not None:
-                    # Validate spans are within chunk's global bounds
-                    if start_char < chunk.start_char or end_char > chunk.end_char:
-                        plan_span_out_of_bounds += 1
-                        citation_invalid = True
-                    # Also validate against global text length
-                    if not validate_citation_span(start_char, end_char, text_length):
-                        citation_invalid = True
-                else:
-                    # Validate chunk bounds
-                    if chunk.start_char < 0 or chunk.end_char > text_length:
-                        citation_invalid = True
-            else:
-                # Chunk doesn't exist
-                citation_invalid = True
-            
-            if citation_invalid:
-                invalid_citations += 1
+    summary_scan = _scan_citations(summary_citations, chunk_map, text_length)
+    plan_scan = _scan_citations(plan_citations, chunk_map, text_length)
+    summary_span_out_of_bounds = summary_scan["span_out_of_bounds"]
+    plan_span_out_of_bounds = plan_scan["span_out_of_bounds"]
+    total_citations = summary_scan["checked"] + plan_scan["checked"]
+    invalid_citations = summary_scan["invalid"] + plan_scan["invalid"]
     
     # Orphan Claims (Hallucination Rate)
     summary_orphans = len(summary_items) - len(summary_items_with_source)
@@ -770,97 +1010,16 @@ def evaluate_summary_and_plan(
     )
     
     # Citation Overlap Jaccard
-    # Calculate Jaccard similarity between citation spans
-    # For items with multiple citations, calculate pairwise Jaccard
-    # Also calculate Jaccard between citations from different items that reference the same chunks
-    jaccard_scores = []
-    
-    # Collect all citations with their spans
-    all_citations = []
-    
-    # Process summary items
-    for item in summary_items_with_source:
-        citation_info = parse_citation_from_text(item.get("source", ""))
-        if citation_info:
-            chunk_id, start_char, end_char, _ = citation_info  # Ignore section_name for Jaccard
-            if chunk_id in chunk_map:
-                chunk = chunk_map[chunk_id]
-                # Use character spans if available, otherwise use chunk spans
-                # Note: spans in citations are already GLOBAL, not local to chunk
-                if start_char is not None and end_char is not None:
-                    all_citations.append({
-                        "span": (start_char, end_char),
-                        "chunk_id": chunk_id,
-                        "item_text": item.get("text", "")[:50],  # First 50 chars for reference
-                    })
-                else:
-                    # Use entire chunk span
-                    all_citations.append({
-                        "span": (chunk.start_char, chunk.end_char),
-                        "chunk_id": chunk_id,
-                        "item_text": item.get("text", "")[:50],
-                    })
-    
-    # Process plan recommendations
-    for rec in plan_recs_with_source:
-        citation_info = parse_citation_from_text(rec.get("source", ""))
-        if citation_info:
-            chunk_id, start_char, end_char, _ = citation_info  # Ignore section_name for Jaccard
-            if chunk_id in chunk_map:
-                chunk = chunk_map[chunk_id]
-                # Note: spans in citations are already GLOBAL, not local to chunk
-                if start_char is not None and end_char is not None:
-                    all_citations.append({
-                        "span": (start_char, end_char),
-                        "chunk_id": chunk_id,
-                        "item_text": rec.get("text", "")[:50],
-                    })
-                else:
-                    all_citations.append({
-                        "span": (chunk.start_char, chunk.end_char),
-                        "chunk_id": chunk_id,
-                        "item_text": rec.get("text", "")[:50],
-                    })
-    
-    # Calculate pairwise Jaccard similarity
-    # Compare all pairs of citations
-    for i in range(len(all_citations)):
-        for j in range(i + 1, len(all_citations)):
-            span1 = all_citations[i]["span"]
-            span2 = all_citations[j]["span"]
-            jaccard = calculate_jaccard_similarity(span1, span2)
-            jaccard_scores.append(jaccard)
-    
-    # Calculate average Jaccard score
-    avg_jaccard = (
-        sum(jaccard_scores) / len(jaccard_scores)
-        if jaccard_scores else 0.0
+    # Calculate pairwise Jaccard similarity between all citation spans
+    # (citations without character spans use their chunk's span)
+    jaccard_pairs, avg_jaccard, min_jaccard, max_jaccard = _pairwise_jaccard_stats(
+        summary_scan["spans"] + plan_scan["spans"]
     )
     
     # Span Consistency
-    span_consistency_checks = 0
-    span_consistency_passed = 0
-    
-    for item in summary_items_with_source:
-        citation_info = parse_citation_from_text(item.get("source", ""))
-        if citation_info:
-            chunk_id, start_char, end_char, _ = citation_info  # Ignore section_name for span consistency
-            if chunk_id in chunk_map:
-                chunk = chunk_map[chunk_id]
-                span_consistency_checks += 1
-                # Check if chunk text is not empty
-                if chunk.text and len(chunk.text) > 0:
-                    span_consistency_passed += 1
-    
-    for rec in plan_recs_with_source:
-        citation_info = parse_citation_from_text(rec.get("source", ""))
-        if citation_info:
-            chunk_id, start_char, end_char, _ = citation_info  # Ignore section_name for span consistency
-            if chunk_id in chunk_map:
-                chunk = chunk_map[chunk_id]
-                span_consistency_checks += 1
-                if chunk.text and len(chunk.text) > 0:
-                    span_consistency_passed += 1
+    # Check that each citation resolving to a chunk points at non-empty chunk text
+    span_consistency_checks = summary_scan["consistency_checks"] + plan_scan["consistency_checks"]
+    span_consistency_passed = summary_scan["consistency_passed"] + plan_scan["consistency_passed"]
     
     span_consistency_rate = (
         span_consistency_passed / span_consistency_checks * 100
@@ -890,7 +1049,7 @@ def evaluate_summary_and_plan(
     
     confidence_distribution = {
         "count": len(confidence_scores),
-        "mean": sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0,
+        "mean": statistics.fmean(confidence_scores) if confidence_scores else 0.0,
         "median": statistics.median(confidence_scores) if confidence_scores else None,
         "min": min(confidence_scores) if confidence_scores else None,
         "max": max(confidence_scores) if confidence_scores else None,
@@ -934,10 +1093,10 @@ def evaluate_summary_and_plan(
             "hallucination_rate_percentage": round(hallucination_rate, 2),
         },
         "citation_overlap_jaccard": {
-            "total_citation_pairs": len(jaccard_scores),
+            "total_citation_pairs": jaccard_pairs,
             "average_jaccard_similarity": round(avg_jaccard, 4),
-            "min_jaccard": round(min(jaccard_scores), 4) if jaccard_scores else None,
-            "max_jaccard": round(max(jaccard_scores), 4) if jaccard_scores else None,
+            "min_jaccard": round(min_jaccard, 4) if min_jaccard is not None else None,
+            "max_jaccard": round(max_jaccard, 4) if max_jaccard is not None else None,
         },
         "span_consistency": {
             "checks_performed": span_consistency_checks,
@@ -968,8 +1127,11 @@ def save_evaluation(evaluation: Dict, output_path: Path) -> None:
         output_path: Path to save evaluation JSON file
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(evaluation, f, indent=2, ensure_ascii=False)
+    if ORJSON_AVAILABLE:
+        output_path.write_bytes(orjson.dumps(evaluation, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(evaluation, f, indent=2, ensure_ascii=False)
     
     logger.info(f"Saved evaluation report to {output_path}")
 
@@ -1,8 +1,10 @@
 """Aggregate evaluation summary across multiple documents with visualizations."""
 
+import hashlib
 import json
 import logging
 import statistics
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -15,8 +17,37 @@ except ImportError:
     MATPLOTLIB_AVAILABLE = False
     plt = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads reading evaluation files concurrently
+_EVALUATION_LOAD_WORKERS = 16
+# Sidecar in the plots directory recording the inputs the current plots were drawn from
+_PLOTS_SIGNATURE_FILE = ".plots_signature"
+# Summary sections that generate_plots reads
+_PLOTTED_SECTIONS = (
+    "citation_coverage",
+    "citation_validity",
+    "hallucination_rate",
+    "semantic_accuracy",
+    "confidence_scores",
+    "per_document",
+)
+# Shared stand-in for metric sections missing from an evaluation; never mutated
+_EMPTY: Dict = {}
+
 
 def load_evaluation(evaluation_path: Path) -> Optional[Dict]:
     """Load evaluation JSON file.
@@ -32,6 +63,8 @@ def load_evaluation(evaluation_path: Path) -> Optional[Dict]:
         return None
     
     try:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(evaluation_path.read_bytes())
         with open(evaluation_path, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
@@ -60,16 +93,34 @@ def compute_statistics(values: List[float]) -> Dict:
             "count": 0,
         }
     
+    n = len(values)
+    if NUMPY_AVAILABLE:
+        # One partition yields the quartile and median order statistics; numpy's
+        # mean/std avoid the exact-fraction arithmetic of the statistics module
+        arr = np.asarray(values, dtype=np.float64)
+        lo_mid, hi_mid = (n - 1) // 2, n // 2
+        part = np.partition(arr, (n // 4, lo_mid, hi_mid, 3 * n // 4))
+        return {
+            "mean": round(float(arr.mean()), 4),
+            "median": round(float((part[lo_mid] + part[hi_mid]) / 2), 4),
+            "min": round(float(arr.min()), 4),
+            "max": round(float(arr.max()), 4),
+            "std_dev": round(float(arr.std(ddof=1)) if n > 1 else 0.0, 4),
+            "q25": round(float(part[n // 4]), 4),
+            "q75": round(float(part[3 * n // 4]), 4),
+            "count": n,
+        }
+    
     sorted_values = sorted(values)
     return {
         "mean": round(statistics.mean(values), 4),
         "median": round(statistics.median(values), 4),
-        "min": round(min(values), 4),
-        "max": round(max(values), 4),
-        "std_dev": round(statistics.stdev(values) if len(values) > 1 else 0.0, 4),
-        "q25": round(sorted_values[len(sorted_values) // 4], 4) if len(sorted_values) > 0 else None,
-        "q75": round(sorted_values[3 * len(sorted_values) // 4], 4) if len(sorted_values) > 0 else None,
-        "count": len(values),
+        "min": round(sorted_values[0], 4),
+        "max": round(sorted_values[-1], 4),
+        "std_dev": round(statistics.stdev(values) if n > 1 else 0.0, 4),
+        "q25": round(sorted_values[n // 4], 4),
+        "q75": round(sorted_values[3 * n // 4], 4),
+        "count": n,
     }
 
 
@@ -100,9 +151,16 @@ def generate_evaluation_summary(
     evaluations = []
     valid_docs = []
     
-    for doc_id in document_ids:
-        eval_path = results_dir / doc_id / "evaluation.json"
-        eval_data = load_evaluation(eval_path)
+    # Reads are independent and I/O-bound; map() keeps document order
+    eval_paths = [results_dir / doc_id / "evaluation.json" for doc_id in document_ids]
+    if len(eval_paths) > 1:
+        workers = min(_EVALUATION_LOAD_WORKERS, len(eval_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            loaded = list(executor.map(load_evaluation, eval_paths))
+    else:
+        loaded = [load_evaluation(path) for path in eval_paths]
+    
+    for doc_id, eval_data in zip(document_ids, loaded):
         if eval_data:
             evaluations.append(eval_data)
             valid_docs.append(doc_id)
@@ -131,58 +189,50 @@ def generate_evaluation_summary(
     # Per-document data for plots
     doc_metrics = []
     
-    for i, eval_data in enumerate(evaluations):
-        doc_id = valid_docs[i]
-        
-        # Citation coverage
-        cov = eval_data.get("citation_coverage", {})
-        summary_coverage.append(cov.get("summary_coverage_percentage", 0.0))
-        plan_coverage.append(cov.get("plan_coverage_percentage", 0.0))
-        overall_coverage.append(cov.get("overall_coverage_percentage", 0.0))
-        
-        # Citation validity
-        validity = eval_data.get("citation_validity", {})
-        validity_percentage.append(validity.get("validity_percentage", 0.0))
+    for doc_id, eval_data in zip(valid_docs, evaluations):
+        # Bind each metric section once; absent sections share one empty dict
+        cov = eval_data.get("citation_coverage") or _EMPTY
+        validity = eval_data.get("citation_validity") or _EMPTY
+        orphans = eval_data.get("orphan_claims") or _EMPTY
+        span_cons = eval_data.get("span_consistency") or _EMPTY
+        jaccard = eval_data.get("citation_overlap_jaccard") or _EMPTY
+        summary_stats = eval_data.get("summary_statistics") or _EMPTY
+        conf_dist = summary_stats.get("confidence_score_distribution") or _EMPTY
+        sem_acc = eval_data.get("semantic_accuracy") or _EMPTY
+        # Section mismatches (no longer tracked since citations only use chunk_id, no section titles)
+        section_mismatches = eval_data.get("section_name_mismatches") or _EMPTY
+        span_bounds = eval_data.get("span_out_of_chunk_bounds") or _EMPTY
         
-        # Hallucination rate
-        orphans = eval_data.get("orphan_claims", {})
-        hallucination_rate.append(orphans.get("hallucination_rate_percentage", 0.0))
+        doc_summary_coverage = cov.get("summary_coverage_percentage", 0.0)
+        doc_plan_coverage = cov.get("plan_coverage_percentage", 0.0)
+        doc_validity = validity.get("validity_percentage", 0.0)
+        doc_hallucination = orphans.get("hallucination_rate_percentage", 0.0)
+        doc_confidence = conf_dist.get("mean")
+        doc_similarity = sem_acc.get("average_similarity")
         
-        # Span consistency
-        span_cons = eval_data.get("span_consistency", {})
+        summary_coverage.append(doc_summary_coverage)
+        plan_coverage.append(doc_plan_coverage)
+        overall_coverage.append(cov.get("overall_coverage_percentage", 0.0))
+        validity_percentage.append(doc_validity)
+        hallucination_rate.append(doc_hallucination)
         span_consistency.append(span_cons.get("consistency_percentage", 0.0))
-        
-        # Citation overlap
-        jaccard = eval_data.get("citation_overlap_jaccard", {})
         avg_jaccard.append(jaccard.get("average_jaccard_similarity", 0.0))
-        
-        # Confidence scores
-        conf_dist = eval_data.get("summary_statistics", {}).get("confidence_score_distribution", {})
-        if conf_dist.get("mean") is not None:
-            confidence_scores.append(conf_dist["mean"])
-        
-        # Semantic accuracy
-        sem_acc = eval_data.get("semantic_accuracy")
-        if sem_acc and sem_acc.get("average_similarity") is not None:
-            semantic_similarity.append(sem_acc["average_similarity"])
-        
-        # Section mismatches (no longer tracked since citations only use chunk_id, no section titles)
-        section_mismatches = eval_data.get("section_name_mismatches", {})
+        if doc_confidence is not None:
+            confidence_scores.append(doc_confidence)
+        if doc_similarity is not None:
+            semantic_similarity.append(doc_similarity)
         section_mismatches_total.append(section_mismatches.get("total", 0))
-        
-        # Span out of bounds
-        span_bounds = eval_data.get("span_out_of_chunk_bounds", {})
         span_out_of_bounds_total.append(span_bounds.get("total", 0))
         
         # Store per-document metrics
         doc_metrics.append({
             "doc_id": doc_id,
-            "summary_coverage": cov.get("summary_coverage_percentage", 0.0),
-            "plan_coverage": cov.get("plan_coverage_percentage", 0.0),
-            "validity": validity.get("validity_percentage", 0.0),
-            "hallucination_rate": orphans.get("hallucination_rate_percentage", 0.0),
-            "semantic_similarity": sem_acc.get("average_similarity") if sem_acc else None,
-            "confidence": conf_dist.get("mean") if conf_dist.get("mean") is not None else None,
+            "summary_coverage": doc_summary_coverage,
+            "plan_coverage": doc_plan_coverage,
+            "validity": doc_validity,
+            "hallucination_rate": doc_hallucination,
+            "semantic_similarity": doc_similarity,
+            "confidence": doc_confidence,
         })
     
     # Compute aggregate statistics
@@ -217,8 +267,11 @@ def generate_evaluation_summary(
     
     # Save summary JSON
     summary_path = output_dir / "evaluation_summary.json"
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+    if ORJSON_AVAILABLE:
+        summary_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+    else:
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
     logger.info(f"Saved evaluation summary to {summary_path}")
     
     # Save human-readable summary
@@ -229,6 +282,32 @@ def generate_evaluation_summary(
     return summary
 
 
+def _plots_signature(summary: Dict, doc_ids: List[str]) -> str:
+    """Hash the parts of the summary that determine the rendered plots.
+    
+    Args:
+        summary: Aggregate summary statistics
+        doc_ids: List of document IDs used for labeling
+        
+    Returns:
+        Hex digest identifying the plot inputs
+    """
+    payload = {key: summary.get(key) for key in _PLOTTED_SECTIONS}
+    payload["doc_ids"] = doc_ids
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _expected_plot_files(summary: Dict) -> List[str]:
+    """List the plot files generate_plots writes for a summary."""
+    files = ["citation_coverage.png", "validity_hallucination.png", "metrics_overview.png"]
+    if summary.get("semantic_accuracy") and summary["semantic_accuracy"]["count"] > 0:
+        files.append("semantic_accuracy.png")
+    if summary["confidence_scores"]["count"] > 0:
+        files.append("confidence_distribution.png")
+    return files
+
+
 def generate_plots(summary: Dict, plots_dir: Path, doc_ids: List[str]) -> None:
     """Generate visualization plots for evaluation metrics.
     
@@ -240,6 +319,20 @@ def generate_plots(summary: Dict, plots_dir: Path, doc_ids: List[str]) -> None:
     if not MATPLOTLIB_AVAILABLE:
         return
     
+    # Rendering dominates the summary step, so skip it when the existing plots
+    # were drawn from identical inputs
+    signature = _plots_signature(summary, doc_ids)
+    signature_path = plots_dir / _PLOTS_SIGNATURE_FILE
+    try:
+        previous_signature = signature_path.read_text(encoding="utf-8")
+    except OSError:
+        previous_signature = None
+    if previous_signature == signature and all(
+        (plots_dir / name).exists() for name in _expected_plot_files(summary)
+    ):
+        logger.info(f"Plots in {plots_dir} are up to date, skipping generation")
+        return
+    
     # Set style
     plt.style.use('default')
     fig_size = (10, 6)
@@ -424,6 +517,7 @@ def generate_plots(summary: Dict, plots_dir: Path, doc_ids: List[str]) -> None:
     plt.savefig(plots_dir / "metrics_overview.png", dpi=150, bbox_inches='tight')
     plt.close()
     
+    signature_path.write_text(signature, encoding="utf-8")
     logger.info(f"Generated {len(list(plots_dir.glob('*.png')))} plot(s) in {plots_dir}")
 
 
@@ -1,10 +1,11 @@
 """PDF and text file ingestion module."""
 
+import bisect
 import hashlib
 import logging
 import re
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 from pypdf import PdfReader
 
@@ -13,6 +14,9 @@ from app.schemas import CanonicalNote, PageSpan
 
 logger = logging.getLogger(__name__)
 
+# Runs of three or more newlines, collapsed to a single empty line
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+
 
 def generate_note_id(file_path: Path) -> str:
     """Generate a filesystem-safe note ID from file path."""
@@ -51,7 +55,7 @@ def normalize_text(text: str) -> str:
     # Preserve empty lines (double newlines) from original document
     # Only collapse excessive empty lines (3+ consecutive newlines) to 2
     # This preserves the document structure while preventing too many blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _EXCESS_NEWLINES_RE.sub("\n\n", text)
     
     # Note: We do NOT collapse single newlines or double newlines
     # Empty lines (double newlines) are preserved as-is to enable section detection
@@ -59,11 +63,32 @@ def normalize_text(text: str) -> str:
     return text
 
 
-def char_span_to_page(start_char: int, end_char: int, page_spans: list[PageSpan]) -> int:
-    """Map a character span to a page number (one-based)."""
-    for span in page_spans:
-        if span.start_char <= start_char < span.end_char:
-            return span.page_index + 1
+def char_span_to_page(
+    start_char: int,
+    end_char: int,
+    page_spans: list[PageSpan],
+    page_starts: Optional[list[int]] = None,
+) -> int:
+    """Map a character span to a page number (one-based).
+    
+    Args:
+        start_char: Starting character position
+        end_char: Ending character position
+        page_spans: Page spans in document order
+        page_starts: Start offsets of page_spans (CanonicalNote.page_starts). When
+            given, the page containing start_char is found by binary search.
+        
+    Returns:
+        int: Page number (one-based)
+    """
+    if page_starts is not None:
+        idx = bisect.bisect_right(page_starts, start_char) - 1
+        if idx >= 0 and start_char < page_spans[idx].end_char:
+            return page_spans[idx].page_index + 1
+    else:
+        for span in page_spans:
+            if span.start_char <= start_char < span.end_char:
+                return span.page_index + 1
     for span in page_spans:
         if span.start_char <= end_char <= span.end_char:
             return span.page_index + 1
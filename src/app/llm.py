@@ -137,8 +137,10 @@ class LLMClient:
         self.temperature = config.temperature
         self.max_retries = config.max_retries
 
-        # Check Ollama availability and model existence
-        self._check_ollama_availability()
+        # Check Ollama availability and model existence (unless already verified)
+        if not config.ollama_checked:
+            self._check_ollama_availability()
+            config.mark_ollama_checked()
 
         # Configure MPS for Apple Silicon if available
         mps_configured = _configure_mps_for_ollama()
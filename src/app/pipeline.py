@@ -4,12 +4,23 @@ This module coordinates the entire clinical note parsing pipeline, including
 ingestion, section detection, chunking, summarization, planning, and evaluation.
 """
 
+import json
 import logging
+import os
+import stat
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
 # Add src directory to Python path so imports work without PYTHONPATH=src
 _script_dir = Path(__file__).parent
 _project_root = _script_dir.parent.parent
@@ -39,6 +50,37 @@ logger = logging.getLogger(__name__)
 # This ensures environment variables are set before any Ollama clients are created
 _configure_mps_for_ollama()
 
+# A successful Ollama check is remembered on disk for this many seconds, so
+# repeated CLI invocations (shell loops, xargs) skip the probe
+_OLLAMA_CHECK_CACHE_TTL_SECONDS = 30
+
+# Ollama API endpoints for each health check method (see Config.health_check_methods)
+_HEALTH_CHECK_ENDPOINTS = {
+    "version": "/api/version",
+    "tags": "/api/tags",
+}
+_HEALTH_CHECK_TIMEOUT_SECONDS = 2
+
+_BANNER_RULE = "=" * 70
+# Shown by the CLI and run_pipeline when the Ollama check fails
+_OLLAMA_ERROR_TEMPLATE = f"""
+{_BANNER_RULE}
+ERROR: Ollama is not available or model is not installed
+{_BANNER_RULE}
+
+{{error_msg}}
+
+To fix this issue:
+  1. Ensure Ollama is installed: https://ollama.ai
+  2. Start Ollama service (if not running)
+  3. Install the model: ollama pull {{model_name}}
+
+To check available models, run: ollama list
+
+Note: Use --toc-only to generate only the table of contents (no LLM required)
+{_BANNER_RULE}
+"""
+
 
 def setup_logging(output_dir: Path, verbose: bool = False) -> None:
     """Set up logging to both file and console.
@@ -81,48 +123,196 @@ def setup_logging(output_dir: Path, verbose: bool = False) -> None:
     logger.info(f"Logging configured: file={log_file}, level={logging.getLevelName(log_level)}")
 
 
-def check_ollama_availability(config: Config) -> tuple[bool, Optional[str]]:
-    """Check if Ollama is available and model exists.
+def _ollama_check_cache_path() -> Path:
+    """Get the path of the on-disk Ollama check cache."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "clinicalnoteparser" / "ollama_ok.json"
+
+
+def _ollama_check_cached(config: Config) -> bool:
+    """Check for a recent successful Ollama check for this URL and model."""
+    try:
+        with open(_ollama_check_cache_path(), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        return (
+            cached.get("url") == config.ollama_base_url
+            and cached.get("model") == config.model_name
+            and 0 <= time.time() - cached.get("ts", 0) < _OLLAMA_CHECK_CACHE_TTL_SECONDS
+        )
+    except (OSError, ValueError, AttributeError, TypeError):
+        return False
+
+
+def _record_ollama_check(config: Config) -> None:
+    """Record a successful Ollama check on disk (best effort, written atomically)."""
+    cache_path = _ollama_check_cache_path()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"url": config.ollama_base_url, "model": config.model_name, "ts": time.time()}, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write Ollama check cache: {e}")
+
+
+def _check_ollama_http(config: Config) -> tuple[bool, Optional[str]]:
+    """Probe the Ollama HTTP API with the endpoints in config.health_check_methods.
+    
+    "version" (GET /api/version) is a tiny response that confirms the server
+    is up; "tags" (GET /api/tags) lists installed models and confirms that
+    config.model_name is one of them. Methods run in order and the first
+    failure is reported. A successful "tags" probe proves everything the
+    check needs, so any later methods are skipped.
     
     Args:
         config: Configuration object
         
     Returns:
         tuple[bool, Optional[str]]: (is_available, error_message)
-            - is_available: True if Ollama is available and model exists
-            - error_message: Human-readable error message if not available, None otherwise
     """
-    try:
-        import subprocess
+    base_url = config.ollama_base_url.rstrip("/")
+    for method in config.health_check_methods:
+        endpoint = _HEALTH_CHECK_ENDPOINTS[method]
+        try:
+            response = config.session.get(base_url + endpoint, timeout=_HEALTH_CHECK_TIMEOUT_SECONDS)
+        except requests.Timeout:
+            return False, "Ollama is not responding. Please ensure Ollama is running."
+        except requests.RequestException:
+            return False, f"Ollama is not running at {base_url}. Please start Ollama service."
+        
+        if response.status_code != 200:
+            return False, f"Ollama returned HTTP {response.status_code} for {endpoint}."
+        
+        if method == "tags":
+            try:
+                models = response.json().get("models", [])
+                model_names = [m.get("name", "") for m in models]
+            except (ValueError, AttributeError):
+                return False, f"Unexpected /api/tags response from Ollama at {base_url}."
+            # Same matching as 'ollama list': the configured name may omit the tag
+            if not any(config.model_name in name for name in model_names):
+                return False, (
+                    f"Model '{config.model_name}' not found. "
+                    f"Available models: {', '.join(model_names) if model_names else 'none'}. "
+                    f"Install it with: ollama pull {config.model_name}"
+                )
+            return True, None
+    
+    return True, None
+
+
+def _check_ollama_cli(config: Config) -> tuple[bool, Optional[str]]:
+    """Check Ollama and the configured model with the 'ollama list' command.
+    
+    Args:
+        config: Configuration object
         
+    Returns:
+        tuple[bool, Optional[str]]: (is_available, error_message)
+    """
+    import subprocess
+    
+    try:
         result = subprocess.run(
             ["ollama", "list"],
             capture_output=True,
             text=True,
             timeout=5,
         )
-        
-        if result.returncode != 0:
-            return False, "Ollama is not running. Please start Ollama service."
-        
-        # Check if model exists
-        if config.model_name not in result.stdout:
-            available_models = result.stdout.strip().split('\n')[1:] if result.stdout.strip() else []
-            available_list = ', '.join([m.split()[0] for m in available_models if m.strip()]) if available_models else "none"
-            return False, (
-                f"Model '{config.model_name}' not found. "
-                f"Available models: {available_list if available_list else 'none'}. "
-                f"Install it with: ollama pull {config.model_name}"
-            )
-        
-        return True, None
     except FileNotFoundError:
         return False, "Ollama command not found. Please install Ollama from https://ollama.ai"
     except subprocess.TimeoutExpired:
         return False, "Ollama is not responding. Please ensure Ollama is running."
+    
+    if result.returncode != 0:
+        return False, "Ollama is not running. Please start Ollama service."
+    
+    # Check if model exists
+    if config.model_name not in result.stdout:
+        available_models = result.stdout.strip().split('\n')[1:] if result.stdout.strip() else []
+        available_list = ', '.join([m.split()[0] for m in available_models if m.strip()]) if available_models else "none"
+        return False, (
+            f"Model '{config.model_name}' not found. "
+            f"Available models: {available_list if available_list else 'none'}. "
+            f"Install it with: ollama pull {config.model_name}"
+        )
+    
+    return True, None
+
+
+def check_ollama_availability(config: Config, use_disk_cache: bool = False) -> tuple[bool, Optional[str]]:
+    """Check if Ollama is available and model exists.
+    
+    Uses the Ollama HTTP API at config.ollama_base_url (see
+    _check_ollama_http), falling back to the 'ollama list' command when no
+    base URL is configured or requests is not installed. A successful
+    check is recorded on the config for its base URL and model (see
+    Config.ollama_checked), so later calls with the same config or a copy
+    of it (e.g. from batch workers) return immediately.
+    
+    Args:
+        config: Configuration object
+        use_disk_cache: Reuse a successful check from the last
+            _OLLAMA_CHECK_CACHE_TTL_SECONDS seconds (across processes) for
+            the same base URL and model, and record successful checks
+        
+    Returns:
+        tuple[bool, Optional[str]]: (is_available, error_message)
+            - is_available: True if Ollama is available and model exists
+            - error_message: Human-readable error message if not available, None otherwise
+    """
+    if config.ollama_checked:
+        return True, None
+    
+    if use_disk_cache and _ollama_check_cached(config):
+        config.mark_ollama_checked()
+        return True, None
+    
+    try:
+        if REQUESTS_AVAILABLE and config.ollama_base_url:
+            is_available, error_msg = _check_ollama_http(config)
+        else:
+            is_available, error_msg = _check_ollama_cli(config)
     except Exception as e:
         logger.debug(f"Ollama check failed: {e}")
         return False, f"Error checking Ollama availability: {e}"
+    
+    if is_available:
+        config.mark_ollama_checked()
+        if use_disk_cache:
+            _record_ollama_check(config)
+    return is_available, error_msg
+
+
+def start_ollama_check(config: Config, use_disk_cache: bool = False) -> "Future[tuple[bool, Optional[str]]]":
+    """Start check_ollama_availability in a background thread.
+    
+    Lets the availability round-trip overlap with loading the document;
+    call .result() on the returned future before the first LLM step.
+    
+    Args:
+        config: Configuration object
+        use_disk_cache: Passed through to check_ollama_availability
+        
+    Returns:
+        Future[tuple[bool, Optional[str]]]: Future for (is_available, error_message)
+    """
+    if config.ollama_checked:
+        # Already verified for this config; no thread needed
+        future: "Future[tuple[bool, Optional[str]]]" = Future()
+        future.set_result((True, None))
+        return future
+    
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ollama-check")
+    future = executor.submit(check_ollama_availability, config, use_disk_cache)
+    # The worker thread exits once the check finishes
+    executor.shutdown(wait=False)
+    return future
 
 
 def validate_input_file(file_path: Path) -> tuple[bool, Optional[str]]:
@@ -134,10 +324,13 @@ def validate_input_file(file_path: Path) -> tuple[bool, Optional[str]]:
     Returns:
         tuple[bool, Optional[str]]: (is_valid, error_message)
     """
-    if not file_path.exists():
+    # One stat answers both "exists" and "is a regular file"
+    try:
+        st = os.stat(file_path)
+    except OSError:
         return False, f"Input file does not exist: {file_path}"
     
-    if not file_path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return False, f"Input path is not a file: {file_path}"
     
     if not file_path.suffix.lower() in (".pdf", ".txt"):
@@ -162,9 +355,14 @@ def run_pipeline(
     plan_only: bool = False,
     no_evaluation: bool = False,
     verbose: bool = False,
+    ollama_check: Optional["Future[tuple[bool, Optional[str]]]"] = None,
 ) -> int:
     """Run the clinical note parsing pipeline.
     
+    When the LLM is needed, the Ollama availability check runs in the
+    background while the document is ingested and is awaited before
+    section detection (the first step that may call the LLM).
+    
     Args:
         input_path: Path to input PDF or .txt file
         output_dir: Output directory (default: results/{note_id})
@@ -174,6 +372,9 @@ def run_pipeline(
         plan_only: Only generate plan (requires summary generation first, skips evaluation)
         no_evaluation: Generate TOC, summary, and plan but skip evaluation
         verbose: Enable verbose logging
+        ollama_check: Availability check already started with start_ollama_check
+            (default: start one here if the LLM is needed). A caller-started
+            check also has its success printed once it completes.
         
     Returns:
         int: Exit code (0 for success, 1 for failure)
@@ -198,28 +399,15 @@ def run_pipeline(
         needs_plan = plan_only or (not toc_only and not summary_only and not no_evaluation)
         needs_evaluation = not toc_only and not summary_only and not plan_only and not no_evaluation
         
-        # Pre-flight checks
+        # Pre-flight checks (the Ollama check overlaps with ingestion)
+        # The caller announced its own check, so report the outcome to the user too
+        report_ollama_check = ollama_check is not None
         if needs_llm:
             logger.info("Checking Ollama availability...")
-            is_available, error_msg = check_ollama_availability(config)
-            if not is_available:
-                error_display = (
-                    f"\n{'='*70}\n"
-                    f"ERROR: Ollama is not available or model '{config.model_name}' is not installed\n"
-                    f"{'='*70}\n"
-                    f"\n{error_msg}\n"
-                    f"\nTo fix this issue:\n"
-                    f"  1. Ensure Ollama is installed: https://ollama.ai\n"
-                    f"  2. Start Ollama service (if not running)\n"
-                    f"  3. Install the model: ollama pull {config.model_name}\n"
-                    f"\nTo check available models, run: ollama list\n"
-                    f"\nNote: Use --toc-only to generate only the table of contents (no LLM required)\n"
-                    f"{'='*70}\n"
-                )
-                logger.error(error_display)
-                print(error_display, file=sys.stderr)
-                return 1
-            logger.info("✓ Ollama is available")
+            if ollama_check is None:
+                ollama_check = start_ollama_check(config)
+        else:
+            ollama_check = None
         
         # Determine note_id and output directory early (before ingestion)
         # This allows us to check for existing chunks
@@ -239,7 +427,7 @@ def run_pipeline(
         
         # Check if chunks already exist (for skipping ingestion/chunking)
         chunks_path = output_dir / "chunks.json"
-        chunks_exist = chunks_path.exists() and needs_chunks
+        chunks_exist = needs_chunks and chunks_path.is_file()
         
         if chunks_exist:
             try:
@@ -296,6 +484,18 @@ def run_pipeline(
         else:
             logger.info("[STEP 1] Skipped (using existing chunks)")
         
+        # Wait for the Ollama check before any step that may call the LLM
+        if ollama_check is not None:
+            is_available, error_msg = ollama_check.result()
+            if not is_available:
+                error_display = _OLLAMA_ERROR_TEMPLATE.format(error_msg=error_msg, model_name=config.model_name)
+                logger.error(error_display)
+                print(error_display, file=sys.stderr)
+                return 1
+            logger.info("✓ Ollama is available")
+            if report_ollama_check:
+                print("✓ Ollama is available\n")
+        
         # Step 2: Detect sections (if chunks don't exist or sections not loaded)
         total_steps = 2  # ingestion + sections
         if needs_chunks:
@@ -598,10 +798,6 @@ def _is_already_processed(
     else:
         output_dir = output_base_dir / note_id
     
-    # Check if output directory exists
-    if not output_dir.exists():
-        return False
-    
     # Determine which file indicates completion based on execution mode
     if toc_only:
         # For toc_only, check if toc.json exists
@@ -619,7 +815,8 @@ def _is_already_processed(
         # For full pipeline, check if evaluation.json exists (final output)
         completion_file = output_dir / "evaluation.json"
     
-    return completion_file.exists()
+    # One stat: a missing output directory also means a missing completion file
+    return completion_file.is_file()
 
 
 def run_pipeline_batch(
@@ -655,6 +852,10 @@ def run_pipeline_batch(
     if config is None:
         config = get_config()
     
+    # Documents are already processed in parallel; avoid nesting a chunking pool per document
+    if workers > 1 and config.chunking_workers > 1:
+        config = config.model_copy(update={"chunking_workers": 1})
+    
     # Set up root logger for batch processing
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
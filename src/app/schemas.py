@@ -1,5 +1,6 @@
 """Pydantic models for clinical note parsing pipeline."""
 
+from functools import cached_property
 from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator
@@ -29,6 +30,11 @@ class CanonicalNote(BaseModel):
         ..., description="List of page spans mapping character positions to pages"
     )
 
+    @cached_property
+    def page_starts(self) -> List[int]:
+        """Start offsets of page_spans, for bisecting character positions to pages."""
+        return [span.start_char for span in self.page_spans]
+
 
 class Section(BaseModel):
     """Represents a section in the document table of contents."""
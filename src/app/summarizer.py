@@ -118,7 +118,9 @@ def extract_facts_from_chunk(
                 end_global = chunk.start_char + end_local
 
                 # Get page number
-                page = char_span_to_page(start_global, end_global, canonical_note.page_spans)
+                page = char_span_to_page(
+                    start_global, end_global, canonical_note.page_spans, canonical_note.page_starts
+                )
 
                 validated_citations.append(
                     Citation(
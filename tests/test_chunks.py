@@ -5,10 +5,57 @@ from pathlib import Path
 
 import pytest
 
-from app.chunks import create_chunks_from_sections, load_chunks, save_chunks
+from app.chunks import (
+    create_chunks_from_sections,
+    load_chunks,
+    save_chunks,
+    split_into_paragraphs,
+    split_into_sentences,
+    split_long_paragraph,
+)
 from app.schemas import Chunk
 
 
+class TestParagraphSplitting:
+    """Tests for paragraph splitting."""
+
+    def test_split_into_paragraphs_offsets(self):
+        """Test that paragraph offsets point at the paragraph in the source text."""
+        text = "  First para.\n\n\n\nSecond para  \n\nThird"
+        paragraphs = split_into_paragraphs(text)
+        assert [p for p, _ in paragraphs] == ["First para.", "Second para", "Third"]
+        for para, offset in paragraphs:
+            assert text[offset:offset + len(para)] == para
+
+
+class TestSentenceSplitting:
+    """Tests for sentence boundary splitting."""
+
+    def test_split_into_sentences_basic(self):
+        """Test splitting at . ! ? followed by whitespace."""
+        sentences = split_into_sentences("First one. Second one!  Third one?\nFourth")
+        assert sentences == ["First one.", "Second one!", "Third one?", "Fourth"]
+
+    def test_split_into_sentences_ignores_inline_punctuation(self):
+        """Test that punctuation not followed by whitespace is not a boundary."""
+        assert split_into_sentences("Dose 2.5 mg daily.") == ["Dose 2.5 mg daily."]
+
+    def test_split_long_paragraph_respects_max_size(self):
+        """Test that long paragraphs are split into pieces under max_size."""
+        paragraph = " ".join(["This is a sentence."] * 20)
+        pieces = split_long_paragraph(paragraph, 100)
+        assert len(pieces) > 1
+        assert all(len(piece) <= 100 for piece in pieces)
+        assert " ".join(pieces) == paragraph
+
+    def test_split_long_text_matches_short_text_scan(self):
+        """Test that long texts (scanned with numpy) split like short ones."""
+        text = "Temp 37.5 C. Pain é resolved!\n\tRecheck?  Yes.\u3000Done. " * 100
+        expected = ["Temp 37.5 C.", "Pain é resolved!", "Recheck?", "Yes.", "Done."] * 100
+        assert len(text) > 2048
+        assert split_into_sentences(text) == expected
+
+
 class TestCreateChunksFromSections:
     """Tests for creating chunks from sections."""
 
@@ -109,6 +156,77 @@ class TestCreateChunksFromSections:
         assert len(chunks) >= 1
 
 
+    def test_chunk_spans_match_source_text(self, sample_config):
+        """Test that chunk offsets point at the paragraphs they contain."""
+        from app.ingestion import PageSpan
+        from app.schemas import CanonicalNote, Section
+
+        text = "\n\n".join(f"Paragraph number {i} of the note." for i in range(40))
+        note = CanonicalNote(
+            text=text,
+            page_spans=[PageSpan(start_char=0, end_char=len(text), page_index=0)],
+        )
+        section = Section(title="Body", start_char=0, end_char=len(text), start_page=0, end_page=0)
+        sample_config.chunk_size = 200
+        sample_config.chunk_overlap = 0
+
+        chunks = create_chunks_from_sections([section], note, sample_config)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert note.text[chunk.start_char:chunk.end_char].startswith(chunk.text[:20])
+            assert note.text[chunk.start_char:chunk.end_char].endswith(chunk.text[-20:])
+
+    def test_chunk_paragraphs_are_separated(self, sample_config):
+        """Test that paragraphs merged into one chunk keep a blank-line separator."""
+        from app.ingestion import PageSpan
+        from app.schemas import CanonicalNote, Section
+
+        text = "First paragraph.\n\nSecond paragraph.\n\nThird paragraph."
+        note = CanonicalNote(
+            text=text,
+            page_spans=[PageSpan(start_char=0, end_char=len(text), page_index=0)],
+        )
+        section = Section(title="Body", start_char=0, end_char=len(text), start_page=0, end_page=0)
+
+        chunks = create_chunks_from_sections([section], note, sample_config)
+
+        assert len(chunks) == 1
+        assert chunks[0].text == text
+
+    def test_parallel_chunking_matches_sequential(self, sample_sections, sample_canonical_note, sample_config):
+        """Test that chunking sections on a thread pool gives the same chunks."""
+        sequential = create_chunks_from_sections(sample_sections, sample_canonical_note, sample_config)
+        sample_config.chunking_workers = 4
+        parallel = create_chunks_from_sections(sample_sections, sample_canonical_note, sample_config)
+
+        assert [c.model_dump() for c in parallel] == [c.model_dump() for c in sequential]
+
+
+class TestSaveChunks:
+    """Tests for saving chunks to JSON."""
+
+    def test_save_chunks_rejects_empty_text(self, sample_chunks, tmp_path):
+        """Test that a chunk without text is rejected."""
+        invalid = sample_chunks[0].model_copy(update={"text": ""})
+
+        with pytest.raises(ValueError, match="Invalid chunk"):
+            save_chunks([invalid], tmp_path / "chunks.json")
+
+    def test_save_chunks_bytes_independent_of_orjson(self, sample_chunks, tmp_path, monkeypatch):
+        """Test that the json fallback writes the same bytes as orjson."""
+        import app.chunks as chunks_module
+
+        if not chunks_module.ORJSON_AVAILABLE:
+            pytest.skip("orjson not available")
+        chunks = sample_chunks + [sample_chunks[0].model_copy(update={"chunk_id": "x", "text": 'é "q"\n\t\x01'})]
+        save_chunks(chunks, tmp_path / "orjson.json")
+        monkeypatch.setattr(chunks_module, "ORJSON_AVAILABLE", False)
+        save_chunks(chunks, tmp_path / "json.json")
+
+        assert (tmp_path / "json.json").read_bytes() == (tmp_path / "orjson.json").read_bytes()
+
+
 class TestLoadChunks:
     """Tests for loading chunks from JSON."""
 
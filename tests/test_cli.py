@@ -0,0 +1,107 @@
+"""Tests for CLI input resolution helpers."""
+
+from pathlib import Path
+
+import pytest
+
+from app.cli import _glob_files, _index_search_bases, _resolve_input_path
+
+
+class TestResolveInputPath:
+    """Tests for resolving bare input filenames."""
+
+    def test_resolve_in_current_directory(self, tmp_path, monkeypatch):
+        """Test that a file in the current directory is found first."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "570.pdf").write_text("x")
+
+        assert _resolve_input_path("570.pdf") == (tmp_path / "570.pdf").resolve()
+
+    def test_resolve_in_search_base(self, tmp_path, monkeypatch):
+        """Test that search bases are tried in order after the current directory."""
+        monkeypatch.chdir(tmp_path)
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+        (second / "570.pdf").write_text("x")
+
+        resolved = _resolve_input_path("570.pdf", (str(first), str(second)))
+        assert resolved == (second / "570.pdf").resolve()
+
+    def test_resolve_ignores_directories(self, tmp_path, monkeypatch):
+        """Test that a directory with the requested name is not a match."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "570.pdf").mkdir()
+
+        assert _resolve_input_path("570.pdf", ()) is None
+
+    def test_resolve_relative_path_in_search_base(self, tmp_path, monkeypatch):
+        """Test that relative paths are also looked up under the search bases."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "base" / "sub").mkdir(parents=True)
+        (tmp_path / "base" / "sub" / "570.pdf").write_text("x")
+
+        resolved = _resolve_input_path("sub/570.pdf", ("base",))
+        assert resolved == (tmp_path / "base" / "sub" / "570.pdf").resolve()
+
+    def test_resolve_absolute_path(self, tmp_path):
+        """Test that absolute paths are only checked as given."""
+        (tmp_path / "570.pdf").write_text("x")
+
+        assert _resolve_input_path(str(tmp_path / "570.pdf")) == (tmp_path / "570.pdf").resolve()
+        assert _resolve_input_path(str(tmp_path / "missing.pdf")) is None
+
+
+class TestIndexSearchBases:
+    """Tests for the batch filename index."""
+
+    def test_index_prefers_earlier_directories(self, tmp_path, monkeypatch):
+        """Test that the first directory in search order wins and dirs are skipped."""
+        monkeypatch.chdir(tmp_path)
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+        (first / "a.pdf").write_text("x")
+        (second / "a.pdf").write_text("x")
+        (second / "b.pdf").write_text("x")
+        (first / "c.pdf").mkdir()
+
+        index = _index_search_bases((str(first), str(second), str(tmp_path / "missing")))
+        assert index["a.pdf"] == str(first)
+        assert index["b.pdf"] == str(second)
+        assert "c.pdf" not in index
+
+
+class TestGlobFiles:
+    """Tests for batch glob expansion."""
+
+    def test_glob_relative_and_recursive(self, tmp_path, monkeypatch):
+        """Test relative and recursive patterns."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "notes" / "sub").mkdir(parents=True)
+        (tmp_path / "notes" / "a.pdf").write_text("x")
+        (tmp_path / "notes" / "sub" / "b.pdf").write_text("x")
+        (tmp_path / "notes" / "c.txt").write_text("x")
+
+        assert sorted(p.name for p in _glob_files("notes/*.pdf")) == ["a.pdf"]
+        assert sorted(p.name for p in _glob_files("notes/**/*.pdf")) == ["a.pdf", "b.pdf"]
+
+    def test_glob_skips_hidden_and_directories(self, tmp_path, monkeypatch):
+        """Test glob.glob semantics: hidden names are skipped and "dir/**" yields files."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "notes" / "sub").mkdir(parents=True)
+        (tmp_path / "notes" / "a.pdf").write_text("x")
+        (tmp_path / "notes" / ".draft.pdf").write_text("x")
+        (tmp_path / "notes" / "sub" / "b.pdf").write_text("x")
+
+        assert sorted(p.name for p in _glob_files("notes/*.pdf")) == ["a.pdf"]
+        assert sorted(p.name for p in _glob_files("notes/.*.pdf")) == [".draft.pdf"]
+        assert sorted(p.name for p in _glob_files("notes/**")) == ["a.pdf", "b.pdf"]
+
+    def test_glob_absolute_pattern(self, tmp_path):
+        """Test that absolute patterns are supported."""
+        (tmp_path / "a.pdf").write_text("x")
+
+        assert _glob_files(str(tmp_path / "*.pdf")) == [tmp_path / "a.pdf"]
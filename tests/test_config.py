@@ -57,8 +57,7 @@ class TestConfig:
     def test_get_config_singleton(self):
         """Test that get_config() returns a singleton."""
         # Reset the global config
-        import app.config
-        app.config._config = None
+        get_config.cache_clear()
         
         config1 = get_config()
         config2 = get_config()
@@ -80,3 +79,37 @@ class TestConfig:
         with pytest.raises(Exception):  # Pydantic validation error
             Config(temperature=2.1)
 
+    def test_config_health_check_methods(self, monkeypatch):
+        """Test health check methods from env and validation of unknown methods."""
+        monkeypatch.setenv("CLINICAL_NOTE_HEALTH_CHECK_METHODS", "tags")
+        assert Config.from_env().health_check_methods == ["tags"]
+        
+        with pytest.raises(Exception):  # Pydantic validation error
+            Config(health_check_methods=["version", "ping"])
+        
+        with pytest.raises(Exception, match="at least one"):
+            Config(health_check_methods=[])
+
+    def test_config_from_env_validation(self, monkeypatch):
+        """Test that invalid environment values are rejected by from_env."""
+        monkeypatch.setenv("CLINICAL_NOTE_TEMPERATURE", "2.5")
+        with pytest.raises(ValueError, match="temperature"):
+            Config.from_env()
+        
+        monkeypatch.setenv("CLINICAL_NOTE_TEMPERATURE", "0.1")
+        monkeypatch.setenv("CLINICAL_NOTE_CHUNK_OVERLAP", "1500")
+        with pytest.raises(ValueError, match="chunk_overlap must be less than chunk_size"):
+            Config.from_env()
+
+    def test_dotenv_loaded_on_first_from_env(self, tmp_path, monkeypatch):
+        """Test that .env values are read with python-dotenv semantics."""
+        import app.config as config_module
+        
+        dotenv_file = tmp_path / ".env"
+        dotenv_file.write_text('CLINICAL_NOTE_MODEL="llama3.2" # local model\n', encoding="utf-8")
+        monkeypatch.setattr(config_module, "_find_dotenv_file", lambda: dotenv_file)
+        monkeypatch.setattr(config_module, "_dotenv_loaded", False)
+        monkeypatch.delenv("CLINICAL_NOTE_MODEL", raising=False)
+        
+        # monkeypatch restores the original CLINICAL_NOTE_MODEL on teardown
+        assert Config.from_env().model_name == "llama3.2"
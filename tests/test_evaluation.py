@@ -2,15 +2,24 @@
 
 import json
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 
 from app.evaluation import (
+    ParsedCitation,
+    _embedding_cache,
+    _get_ollama_embeddings_batch,
+    _pairwise_jaccard_stats,
+    _scan_citations,
     calculate_jaccard_similarity,
+    evaluate_semantic_accuracy,
     evaluate_summary_and_plan,
     extract_items_from_summary,
     extract_recommendations_from_plan,
     parse_citation_from_text,
+    save_evaluation,
     validate_citation_span,
 )
 from app.ingestion import CanonicalNote, PageSpan
@@ -44,6 +53,7 @@ class TestCitationParsing:
         """Test parsing citation with section name."""
         result = parse_citation_from_text("PLAN, chunk_6")
         assert result is not None
+        assert result.section_name == "PLAN"
         chunk_id, start_char, end_char, section_name = result
         assert chunk_id == "chunk_6"
         assert start_char is None
@@ -60,6 +70,14 @@ class TestCitationParsing:
         result = parse_citation_from_text("")
         assert result is None
 
+    def test_parse_citation_without_chunk(self):
+        """Test that citations without a chunk reference are rejected."""
+        assert parse_citation_from_text("PLAN, page 2") is None
+
+    def test_parse_citation_ignores_surrounding_whitespace(self):
+        """Test that padded citations parse the same as stripped ones."""
+        assert parse_citation_from_text("  PLAN, chunk_6\n") == parse_citation_from_text("PLAN, chunk_6")
+
 
 class TestCitationValidation:
     """Tests for citation span validation."""
@@ -84,6 +102,20 @@ class TestCitationValidation:
         """Test validating a span with None values (should pass)."""
         assert validate_citation_span(None, None, 200) is True
 
+    def test_scan_citations_counts(self, sample_chunks):
+        """Test counting invalid and out-of-chunk citations."""
+        chunk_map = {chunk.chunk_id: chunk for chunk in sample_chunks}
+        citations = [
+            ({}, ParsedCitation("chunk_0", 10, 40, None)),  # Valid
+            ({}, ParsedCitation("chunk_0", 40, 60, None)),  # Extends past chunk_0
+            ({}, ParsedCitation("chunk_99", None, None, None)),  # Unknown chunk
+            ({}, None),  # Unparseable, not counted
+        ]
+        scan = _scan_citations(citations, chunk_map, 1000)
+        assert (scan["checked"], scan["invalid"], scan["span_out_of_bounds"]) == (3, 2, 1)
+        assert scan["spans"] == [(10, 40), (40, 60)]
+        assert (scan["consistency_checks"], scan["consistency_passed"]) == (2, 2)
+
 
 class TestJaccardSimilarity:
     """Tests for Jaccard similarity calculation."""
@@ -116,6 +148,23 @@ class TestJaccardSimilarity:
         similarity = calculate_jaccard_similarity((0, 200), (50, 100))
         assert similarity == 0.25
 
+    def test_pairwise_jaccard_stats_match_single_pair(self, monkeypatch):
+        """Test that blocked pairwise stats match calculate_jaccard_similarity."""
+        spans = [(0, 100), (50, 150), (200, 250), (0, 200), (120, 110)]
+        expected = [
+            calculate_jaccard_similarity(spans[i], spans[j])
+            for i in range(len(spans))
+            for j in range(i + 1, len(spans))
+        ]
+        # Force several row blocks
+        monkeypatch.setattr("app.evaluation._JACCARD_BLOCK_ELEMENTS", 6)
+        pairs, average, lowest, highest = _pairwise_jaccard_stats(spans)
+        assert pairs == len(expected)
+        assert average == pytest.approx(sum(expected) / len(expected))
+        assert lowest == min(expected)
+        assert highest == pytest.approx(max(expected))
+        assert _pairwise_jaccard_stats([(0, 10)]) == (0, 0.0, None, None)
+
 
 class TestSummaryExtraction:
     """Tests for extracting items from summary."""
@@ -170,6 +219,174 @@ class TestPlanExtraction:
         assert recommendations[1]["confidence"] == 0.9
 
 
+class TestEmbeddingBatch:
+    """Tests for batched Ollama embedding requests."""
+
+    @pytest.fixture(autouse=True)
+    def clear_embedding_cache(self):
+        """Start each test with an empty embedding cache."""
+        _embedding_cache.clear()
+        yield
+        _embedding_cache.clear()
+
+    @patch('requests.Session.post')
+    def test_batch_uses_single_request(self, mock_post):
+        """Test that all texts are embedded with one /api/embed call."""
+        response = MagicMock()
+        response.content = json.dumps({"embeddings": [[1.0, 0.0], [0.0, 1.0]]}).encode()
+        mock_post.return_value = response
+        
+        embeddings = _get_ollama_embeddings_batch(["a", "b"], session=requests.Session())
+        
+        assert embeddings == [[1.0, 0.0], [0.0, 1.0]]
+        assert mock_post.call_count == 1
+        assert mock_post.call_args[0][0].endswith("/api/embed")
+
+    @patch('requests.Session.post')
+    def test_batch_falls_back_to_single_requests(self, mock_post):
+        """Test fallback to per-text /api/embeddings when batch endpoint fails."""
+        def post(url, json, timeout):
+            response = MagicMock()
+            if url.endswith("/api/embed"):
+                response.raise_for_status.side_effect = requests.HTTPError("404")
+            else:
+                response.content = b'{"embedding": [%d.0]}' % len(json["prompt"])
+            return response
+        mock_post.side_effect = post
+        
+        embeddings = _get_ollama_embeddings_batch(["a", "bb"], session=requests.Session())
+        
+        assert embeddings == [[1.0], [2.0]]
+        assert mock_post.call_count == 3
+
+    @patch('requests.Session.post')
+    def test_batch_embeds_each_text_once(self, mock_post):
+        """Test that duplicate and previously embedded texts are not re-requested."""
+        response = MagicMock()
+        response.content = json.dumps({"embeddings": [[1.0], [2.0]]}).encode()
+        mock_post.return_value = response
+        session = requests.Session()
+        
+        first = _get_ollama_embeddings_batch(["a", "b", "a"], session=session)
+        second = _get_ollama_embeddings_batch(["b", "a"], session=session)
+        
+        assert first == [[1.0], [2.0], [1.0]]
+        assert second == [[2.0], [1.0]]
+        assert mock_post.call_count == 1
+        assert mock_post.call_args[1]["json"]["input"] == ["a", "b"]
+
+    @patch('requests.Session.post')
+    def test_only_failed_batch_falls_back(self, mock_post, monkeypatch):
+        """Test that texts are sent in fixed-size batches and only a failed batch is retried per text."""
+        monkeypatch.setattr("app.evaluation._EMBEDDING_BATCH_SIZE", 2)
+        
+        def post(url, json, timeout):
+            response = MagicMock()
+            response.status_code = 200
+            if url.endswith("/api/embed"):
+                if "c" in json["input"]:
+                    response.raise_for_status.side_effect = requests.Timeout("timed out")
+                else:
+                    response.content = b'{"embeddings": %s}' % str([[float(len(t))] for t in json["input"]]).encode()
+            else:
+                response.content = b'{"embedding": [%d.0]}' % (10 * len(json["prompt"]))
+            return response
+        mock_post.side_effect = post
+        
+        embeddings = _get_ollama_embeddings_batch(["a", "bb", "c", "dddd", "eeeee"], session=requests.Session())
+        
+        assert embeddings == [[1.0], [2.0], [10.0], [40.0], [5.0]]
+        batch_inputs = [c.kwargs["json"]["input"] for c in mock_post.call_args_list if c.args[0].endswith("/api/embed")]
+        single_prompts = sorted(c.kwargs["json"]["prompt"] for c in mock_post.call_args_list if c.args[0].endswith("/api/embeddings"))
+        assert batch_inputs == [["a", "bb"], ["c", "dddd"], ["eeeee"]]
+        assert single_prompts == ["c", "dddd"]
+
+    @patch('requests.Session.post')
+    def test_missing_batch_endpoint_is_not_retried(self, mock_post, monkeypatch):
+        """Test that a 404 from /api/embed switches the remaining batches to per-text calls."""
+        monkeypatch.setattr("app.evaluation._EMBEDDING_BATCH_SIZE", 1)
+        
+        def post(url, json, timeout):
+            response = MagicMock()
+            response.status_code = 404 if url.endswith("/api/embed") else 200
+            response.content = b'{"embedding": [1.0]}'
+            return response
+        mock_post.side_effect = post
+        
+        embeddings = _get_ollama_embeddings_batch(["a", "b", "c"], session=requests.Session())
+        
+        assert embeddings == [[1.0], [1.0], [1.0]]
+        assert [c.args[0].rsplit("/", 1)[1] for c in mock_post.call_args_list].count("embed") == 1
+
+    @patch('requests.Session.post')
+    def test_cache_is_per_server(self, mock_post):
+        """Test that embeddings cached for one Ollama server are not reused for another."""
+        response = MagicMock()
+        response.content = json.dumps({"embeddings": [[1.0]]}).encode()
+        mock_post.return_value = response
+        session = requests.Session()
+        
+        _get_ollama_embeddings_batch(["a"], base_url="http://host-a:11434", session=session)
+        _get_ollama_embeddings_batch(["a"], base_url="http://host-b:11434", session=session)
+        _get_ollama_embeddings_batch(["a"], base_url="http://host-a:11434", session=session)
+        
+        assert [c.args[0] for c in mock_post.call_args_list] == [
+            "http://host-a:11434/api/embed",
+            "http://host-b:11434/api/embed",
+        ]
+
+
+class TestSemanticAccuracy:
+    """Tests for embedding-based semantic accuracy."""
+
+    @patch('app.evaluation._get_ollama_embeddings_batch')
+    def test_cosine_similarity_per_recommendation(self, mock_batch, sample_chunks, sample_config):
+        """Test that each recommendation is scored against its own cited text."""
+        from app.schemas import PlanRecommendation, StructuredPlan
+        
+        structured_plan = StructuredPlan(
+            recommendations=[
+                PlanRecommendation(number=1, recommendation="First.", source="chunk_0", confidence=1.0),
+                PlanRecommendation(number=2, recommendation="Second.", source="chunk_1", confidence=1.0),
+            ]
+        )
+        # Recommendation embeddings first, then cited-text embeddings
+        mock_batch.return_value = [[1.0, 0.0], [1.0, 0.0], [2.0, 0.0], [0.0, 3.0]]
+        
+        result = evaluate_semantic_accuracy(structured_plan, sample_chunks, config=sample_config)
+        
+        assert mock_batch.call_count == 1
+        scores = [item["similarity_score"] for item in result["per_recommendation"]]
+        assert scores == [1.0, 0.0]
+        assert result["well_supported"] == 1
+        assert result["poorly_supported"] == 1
+        assert result["average_similarity"] == 0.5
+        assert result["support_rate"] == 0.5
+
+    @patch('app.evaluation._get_ollama_embeddings_batch')
+    def test_zero_and_mismatched_embeddings_skipped(self, mock_batch, sample_chunks, sample_config):
+        """Test that unusable embedding pairs are skipped without losing the others."""
+        from app.schemas import PlanRecommendation, StructuredPlan
+        
+        structured_plan = StructuredPlan(
+            recommendations=[
+                PlanRecommendation(number=1, recommendation="Zero.", source="chunk_0", confidence=1.0),
+                PlanRecommendation(number=2, recommendation="Ragged.", source="chunk_1", confidence=1.0),
+                PlanRecommendation(number=3, recommendation="Fine.", source="chunk_0", confidence=1.0),
+            ]
+        )
+        mock_batch.return_value = [
+            [0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0],
+            [1.0, 0.0], [1.0, 0.0], [0.0, 5.0],
+        ]
+        
+        result = evaluate_semantic_accuracy(structured_plan, sample_chunks, config=sample_config)
+        
+        assert [item["number"] for item in result["per_recommendation"]] == [3]
+        assert result["per_recommendation"][0]["similarity_score"] == 1.0
+        assert result["total_recommendations"] == 1
+
+
 class TestEvaluation:
     """Tests for evaluation metrics."""
 
@@ -223,3 +440,11 @@ class TestEvaluation:
         assert evaluation["summary_statistics"]["total_facts_extracted"] > 0
         assert evaluation["summary_statistics"]["total_recommendations_generated"] > 0
 
+    def test_save_evaluation_round_trip(self, tmp_path):
+        """Test that saved evaluation reports load back unchanged."""
+        evaluation = {"citation_validity": {"validity_percentage": 97.5}, "notes": ["café"], "empty": []}
+        output_path = tmp_path / "nested" / "evaluation.json"
+        
+        save_evaluation(evaluation, output_path)
+        
+        assert json.loads(output_path.read_text(encoding="utf-8")) == evaluation
@@ -0,0 +1,177 @@
+"""Tests for aggregate evaluation summary."""
+
+import json
+import statistics
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.evaluation_summary as evaluation_summary
+from app.evaluation_summary import compute_statistics, generate_evaluation_summary
+
+
+class TestComputeStatistics:
+    """Tests for compute_statistics."""
+
+    def test_empty_values(self):
+        """Test that an empty list yields null statistics."""
+        stats = compute_statistics([])
+        assert stats["count"] == 0
+        assert stats["mean"] is None
+        assert stats["q75"] is None
+
+    def test_single_value(self):
+        """Test that a single value has zero standard deviation."""
+        stats = compute_statistics([42.0])
+        assert stats["mean"] == 42.0
+        assert stats["median"] == 42.0
+        assert stats["std_dev"] == 0.0
+        assert stats["q25"] == stats["q75"] == 42.0
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_matches_statistics_module(self, monkeypatch, use_numpy):
+        """Test both code paths against the statistics module."""
+        if use_numpy and not evaluation_summary.NUMPY_AVAILABLE:
+            pytest.skip("numpy not available")
+        monkeypatch.setattr(evaluation_summary, "NUMPY_AVAILABLE", use_numpy)
+
+        for values in ([3.0, 1.0, 2.0], [10.0, 40.0, 20.0, 30.0], [5.5, 0.25, 99.0, 12.0, 7.75, 3.0]):
+            sorted_values = sorted(values)
+            n = len(values)
+            stats = compute_statistics(values)
+            assert stats["mean"] == round(statistics.mean(values), 4)
+            assert stats["median"] == round(statistics.median(values), 4)
+            assert stats["std_dev"] == round(statistics.stdev(values), 4)
+            assert stats["min"] == min(values)
+            assert stats["max"] == max(values)
+            assert stats["q25"] == sorted_values[n // 4]
+            assert stats["q75"] == sorted_values[3 * n // 4]
+            assert stats["count"] == n
+
+
+def _write_evaluation(results_dir, doc_id, data):
+    """Write an evaluation.json for a document under results_dir."""
+    doc_dir = results_dir / doc_id
+    doc_dir.mkdir(parents=True)
+    (doc_dir / "evaluation.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestGenerateEvaluationSummary:
+    """Tests for generate_evaluation_summary."""
+
+    def test_aggregates_per_document_metrics(self, tmp_path, monkeypatch):
+        """Test metric extraction, including documents with missing sections."""
+        monkeypatch.setattr(evaluation_summary, "MATPLOTLIB_AVAILABLE", False)
+        _write_evaluation(tmp_path, "0", {
+            "citation_coverage": {
+                "summary_coverage_percentage": 80.0,
+                "plan_coverage_percentage": 60.0,
+                "overall_coverage_percentage": 70.0,
+            },
+            "citation_validity": {"validity_percentage": 90.0},
+            "orphan_claims": {"hallucination_rate_percentage": 5.0},
+            "summary_statistics": {"confidence_score_distribution": {"mean": 0.8}},
+            "semantic_accuracy": {"average_similarity": 0.75},
+            "span_out_of_chunk_bounds": {"total": 2},
+        })
+        _write_evaluation(tmp_path, "1", {
+            "citation_coverage": {"summary_coverage_percentage": 100.0},
+            "semantic_accuracy": None,
+        })
+
+        summary = generate_evaluation_summary(["0", "1", "missing"], results_dir=tmp_path)
+
+        assert summary["valid_documents"] == ["0", "1"]
+        assert summary["citation_coverage"]["summary"]["mean"] == 90.0
+        assert summary["citation_coverage"]["plan"]["mean"] == 30.0
+        assert summary["confidence_scores"]["count"] == 1
+        assert summary["semantic_accuracy"]["count"] == 1
+        assert summary["span_out_of_chunk_bounds"]["total"]["max"] == 2
+        assert summary["per_document"][1] == {
+            "doc_id": "1",
+            "summary_coverage": 100.0,
+            "plan_coverage": 0.0,
+            "validity": 0.0,
+            "hallucination_rate": 0.0,
+            "semantic_similarity": None,
+            "confidence": None,
+        }
+        assert (tmp_path / "eval_summary" / "evaluation_summary.json").exists()
+        assert (tmp_path / "eval_summary" / "evaluation_summary.txt").exists()
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_summary_json_round_trip(self, tmp_path, monkeypatch, use_orjson):
+        """Test that the saved summary JSON matches the returned summary."""
+        if use_orjson and not evaluation_summary.ORJSON_AVAILABLE:
+            pytest.skip("orjson not available")
+        monkeypatch.setattr(evaluation_summary, "MATPLOTLIB_AVAILABLE", False)
+        monkeypatch.setattr(evaluation_summary, "ORJSON_AVAILABLE", use_orjson)
+        _write_evaluation(tmp_path, "née", {
+            "citation_coverage": {"summary_coverage_percentage": 50.0},
+        })
+
+        summary = generate_evaluation_summary(["née"], results_dir=tmp_path)
+
+        summary_path = tmp_path / "eval_summary" / "evaluation_summary.json"
+        assert json.loads(summary_path.read_text(encoding="utf-8")) == summary
+        assert evaluation_summary.load_evaluation(tmp_path / "née" / "evaluation.json") is not None
+
+
+class TestPlotSignature:
+    """Tests for skipping unchanged plot generation."""
+
+    @staticmethod
+    def _summary():
+        stats = compute_statistics([0.5, 0.7])
+        return {
+            "citation_coverage": {"summary": stats, "plan": stats, "overall": stats},
+            "citation_validity": stats,
+            "hallucination_rate": stats,
+            "semantic_accuracy": None,
+            "confidence_scores": stats,
+            "per_document": [{"doc_id": "0", "confidence": 0.5}, {"doc_id": "1", "confidence": 0.7}],
+            "total_documents": 2,
+        }
+
+    def test_signature_tracks_plotted_inputs(self):
+        """Test that only plotted sections affect the signature."""
+        summary = self._summary()
+        signature = evaluation_summary._plots_signature(summary, ["0", "1"])
+
+        summary["total_documents"] = 3
+        assert evaluation_summary._plots_signature(summary, ["0", "1"]) == signature
+        assert evaluation_summary._plots_signature(summary, ["0", "2"]) != signature
+        summary["per_document"][0]["confidence"] = 0.6
+        assert evaluation_summary._plots_signature(summary, ["0", "1"]) != signature
+
+    def test_skips_when_plots_up_to_date(self, tmp_path, monkeypatch):
+        """Test that matching signature and existing files skip rendering."""
+        monkeypatch.setattr(evaluation_summary, "MATPLOTLIB_AVAILABLE", True)
+        summary = self._summary()
+        doc_ids = ["0", "1"]
+        for name in evaluation_summary._expected_plot_files(summary):
+            (tmp_path / name).write_bytes(b"")
+        (tmp_path / ".plots_signature").write_text(
+            evaluation_summary._plots_signature(summary, doc_ids), encoding="utf-8"
+        )
+        mock_plt = MagicMock()
+        monkeypatch.setattr(evaluation_summary, "plt", mock_plt)
+
+        evaluation_summary.generate_plots(summary, tmp_path, doc_ids)
+
+        mock_plt.subplots.assert_not_called()
+
+    def test_renders_when_plot_missing(self, tmp_path, monkeypatch):
+        """Test that a missing plot file forces rendering despite a matching signature."""
+        monkeypatch.setattr(evaluation_summary, "MATPLOTLIB_AVAILABLE", True)
+        summary = self._summary()
+        doc_ids = ["0", "1"]
+        (tmp_path / ".plots_signature").write_text(
+            evaluation_summary._plots_signature(summary, doc_ids), encoding="utf-8"
+        )
+        mock_plt = MagicMock()
+        mock_plt.subplots.side_effect = RuntimeError("render")
+        monkeypatch.setattr(evaluation_summary, "plt", mock_plt)
+
+        with pytest.raises(RuntimeError, match="render"):
+            evaluation_summary.generate_plots(summary, tmp_path, doc_ids)
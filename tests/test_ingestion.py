@@ -4,8 +4,8 @@ from pathlib import Path
 
 import pytest
 
-from app.ingestion import generate_note_id, ingest_document, load_canonical_note, normalize_text
-from app.schemas import CanonicalNote
+from app.ingestion import char_span_to_page, generate_note_id, ingest_document, load_canonical_note, normalize_text
+from app.schemas import CanonicalNote, PageSpan
 
 
 class TestNormalizeText:
@@ -30,6 +30,10 @@ class TestNormalizeText:
         assert "\r" not in result
         assert "\n" in result
 
+    def test_normalize_text_crlf_is_single_newline(self):
+        """Test that CRLF becomes one newline rather than an empty line."""
+        assert normalize_text("A\r\nB\r\rC\u2009D\u202fE") == "A\nB\n\nC D E"
+
     def test_normalize_text_preserves_empty_lines(self):
         """Test that empty lines (double newlines) are preserved."""
         text = "Line 1\n\nLine 2\n\n\nLine 3"
@@ -46,6 +50,32 @@ class TestNormalizeText:
         assert "\n\n" in result
 
 
+class TestCharSpanToPage:
+    """Tests for mapping character spans to pages."""
+
+    @staticmethod
+    def _note():
+        return CanonicalNote(
+            text="x" * 30,
+            page_spans=[
+                PageSpan(start_char=0, end_char=10, page_index=0),
+                PageSpan(start_char=10, end_char=25, page_index=1),
+                PageSpan(start_char=25, end_char=30, page_index=2),
+            ],
+        )
+
+    @pytest.mark.parametrize(
+        "start_char,end_char,expected",
+        [(0, 5, 1), (9, 12, 1), (10, 11, 2), (24, 26, 2), (29, 30, 3), (30, 30, 3), (40, 45, 1), (-1, 5, 1)],
+    )
+    def test_bisect_matches_linear_scan(self, start_char, end_char, expected):
+        """Test that lookups with page_starts agree with the linear scan."""
+        note = self._note()
+        assert note.page_starts == [0, 10, 25]
+        assert char_span_to_page(start_char, end_char, note.page_spans) == expected
+        assert char_span_to_page(start_char, end_char, note.page_spans, note.page_starts) == expected
+
+
 class TestGenerateNoteId:
     """Tests for note ID generation."""
 
@@ -4,8 +4,9 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 
-from app.pipeline import check_ollama_availability, run_pipeline, validate_input_file
+from app.pipeline import check_ollama_availability, run_pipeline, start_ollama_check, validate_input_file
 
 
 class TestValidateInputFile:
@@ -32,33 +33,164 @@ class TestValidateInputFile:
         assert is_valid is False
         assert "Unsupported file type" in error_msg
 
+    def test_validate_directory(self, tmp_path):
+        """Test validating a directory instead of a file."""
+        directory = tmp_path / "note.pdf"
+        directory.mkdir()
+        is_valid, error_msg = validate_input_file(directory)
+        assert is_valid is False
+        assert "not a file" in error_msg
+
+
+def _ollama_response(models=("llama3:latest",), status_code=200):
+    """Build a mock Ollama API response listing the given models."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = {"version": "0.5.0", "models": [{"name": m} for m in models]}
+    return response
+
 
 class TestCheckOllamaAvailability:
     """Tests for Ollama availability checking."""
 
-    @patch('subprocess.run')
-    def test_check_ollama_available(self, mock_subprocess, sample_config):
+    @patch('requests.Session.get')
+    def test_check_ollama_available(self, mock_get, sample_config):
         """Test checking Ollama when available."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "llama3\n"
-        mock_subprocess.return_value = mock_result
+        mock_get.return_value = _ollama_response()
         
         is_available, error_msg = check_ollama_availability(sample_config)
         assert is_available is True
         assert error_msg is None
+        assert [c.args[0] for c in mock_get.call_args_list] == ["http://localhost:11434/api/tags"]
 
-    @patch('subprocess.run')
-    def test_check_ollama_unavailable(self, mock_subprocess, sample_config):
+    @patch('requests.Session.get')
+    def test_check_ollama_stops_after_tags(self, mock_get, sample_config):
+        """Test that probing stops once /api/tags has confirmed the model."""
+        sample_config.health_check_methods = ["tags", "version"]
+        mock_get.return_value = _ollama_response()
+        
+        assert check_ollama_availability(sample_config) == (True, None)
+        assert [c.args[0] for c in mock_get.call_args_list] == ["http://localhost:11434/api/tags"]
+
+    @patch('requests.Session.get')
+    def test_check_ollama_version_then_tags(self, mock_get, sample_config):
+        """Test that an explicit version probe runs before the tags probe."""
+        sample_config.health_check_methods = ["version", "tags"]
+        mock_get.return_value = _ollama_response()
+        
+        assert check_ollama_availability(sample_config) == (True, None)
+        assert [c.args[0] for c in mock_get.call_args_list] == [
+            "http://localhost:11434/api/version",
+            "http://localhost:11434/api/tags",
+        ]
+
+    @patch('requests.Session.get')
+    def test_check_ollama_tags_not_json(self, mock_get, sample_config):
+        """Test that a non-JSON /api/tags body is reported clearly."""
+        response = _ollama_response()
+        response.json.side_effect = ValueError("Expecting value")
+        mock_get.return_value = response
+        
+        is_available, error_msg = check_ollama_availability(sample_config)
+        assert is_available is False
+        assert "Unexpected /api/tags response" in error_msg
+
+    @patch('requests.Session.get')
+    def test_check_ollama_unavailable(self, mock_get, sample_config):
         """Test checking Ollama when unavailable."""
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_subprocess.return_value = mock_result
+        mock_get.side_effect = requests.ConnectionError("refused")
         
         is_available, error_msg = check_ollama_availability(sample_config)
         assert is_available is False
         assert error_msg is not None
         assert "not running" in error_msg.lower()
+        assert mock_get.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_check_ollama_model_missing(self, mock_get, sample_config):
+        """Test checking Ollama when the configured model is not installed."""
+        mock_get.return_value = _ollama_response(models=("mistral:latest",))
+        
+        is_available, error_msg = check_ollama_availability(sample_config)
+        assert is_available is False
+        assert "not found" in error_msg
+        assert "mistral:latest" in error_msg
+
+    @patch('app.pipeline.ThreadPoolExecutor')
+    def test_start_ollama_check_when_already_checked(self, mock_executor, sample_config):
+        """Test that a config that already passed the check gets a completed future without a thread."""
+        sample_config.mark_ollama_checked()
+        
+        future = start_ollama_check(sample_config)
+        assert future.done()
+        assert future.result() == (True, None)
+        mock_executor.assert_not_called()
+
+    def test_session_is_shared_by_copies(self, sample_config):
+        """Test that the pooled HTTP session is created once and shared by config copies."""
+        session = sample_config.session
+        assert isinstance(session, requests.Session)
+        assert sample_config.session is session
+        assert sample_config.model_copy().session is session
+
+    @patch('subprocess.run')
+    def test_check_ollama_cli_fallback(self, mock_subprocess, sample_config):
+        """Test that 'ollama list' is used when no base URL is configured."""
+        sample_config.ollama_base_url = None
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = "llama3\n"
+        mock_subprocess.return_value = mock_result
+        
+        assert check_ollama_availability(sample_config) == (True, None)
+        assert mock_subprocess.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_check_ollama_cached_on_config(self, mock_get, sample_config):
+        """Test that a successful check is not repeated for the same config."""
+        mock_get.return_value = _ollama_response()
+        
+        assert check_ollama_availability(sample_config) == (True, None)
+        assert check_ollama_availability(sample_config.model_copy()) == (True, None)
+        assert mock_get.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_check_ollama_copy_with_new_model_is_probed(self, mock_get, sample_config):
+        """Test that a copy with a different model or base URL is checked again."""
+        mock_get.return_value = _ollama_response()
+        
+        assert check_ollama_availability(sample_config) == (True, None)
+        other_model = sample_config.model_copy(update={"model_name": "does-not-exist"})
+        assert not other_model.ollama_checked
+        is_available, error_msg = check_ollama_availability(other_model)
+        assert is_available is False
+        assert "does-not-exist" in error_msg
+        assert mock_get.call_count == 2
+        
+        other_server = sample_config.model_copy(update={"ollama_base_url": "http://nowhere:1"})
+        assert check_ollama_availability(other_server) == (True, None)
+        assert mock_get.call_count == 3
+
+    @patch('requests.Session.get')
+    def test_check_ollama_disk_cache(self, mock_get, sample_config, tmp_path, monkeypatch):
+        """Test that a recent successful check is reused across configs via the disk cache."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        mock_get.return_value = _ollama_response(models=("llama3:latest", "mistral:latest"))
+        
+        assert check_ollama_availability(sample_config, use_disk_cache=True) == (True, None)
+        assert mock_get.call_count == 1
+        
+        # A new config (as in another process) is answered from the disk cache
+        fresh_config = sample_config.model_copy()
+        fresh_config._ollama_checked = None
+        assert check_ollama_availability(fresh_config, use_disk_cache=True) == (True, None)
+        assert mock_get.call_count == 1
+        
+        # The disk cache hit is recorded for that URL and model only, so a
+        # copy with a different model is probed again
+        other_config = fresh_config.model_copy(update={"model_name": "mistral"})
+        assert check_ollama_availability(other_config, use_disk_cache=True) == (True, None)
+        assert mock_get.call_count == 2
 
 
 class TestPipelineIntegration:
@@ -169,19 +301,54 @@ class TestPipelineIntegration:
         assert exit_code == 1
 
     @patch('app.pipeline.check_ollama_availability')
-    def test_pipeline_ollama_unavailable(self, mock_ollama_check, sample_txt_path, sample_config):
+    def test_pipeline_ollama_unavailable(self, mock_ollama_check, sample_txt_path, sample_config, tmp_path, capsys):
         """Test pipeline when Ollama is unavailable (for LLM steps)."""
         mock_ollama_check.return_value = (False, "Ollama is not running")
         
         # Should fail when trying to run summary (needs LLM)
         exit_code = run_pipeline(
             input_path=sample_txt_path,
+            output_dir=tmp_path,
             config=sample_config,
             summary_only=True,
             verbose=False,
         )
         
         assert exit_code == 1
+        # The check ran in the background and stopped the pipeline before section detection
+        assert mock_ollama_check.call_count == 1
+        assert not (tmp_path / sample_txt_path.stem / "toc.json").exists()
+        # The shared error banner is shown, with the install hint for the configured model
+        stderr = capsys.readouterr().err
+        assert "ERROR: Ollama is not available or model is not installed" in stderr
+        assert f"ollama pull {sample_config.model_name}" in stderr
+
+    @pytest.mark.parametrize("caller_check", [True, False])
+    @patch('app.pipeline.detect_sections')
+    @patch('app.pipeline.check_ollama_availability')
+    def test_pipeline_reports_caller_ollama_check(
+        self, mock_ollama_check, mock_detect, caller_check, sample_txt_path, sample_config, tmp_path, capsys
+    ):
+        """Test that only a caller-started check's success is printed, before section detection."""
+        mock_ollama_check.return_value = (True, None)
+        stdout_at_detection = []
+        
+        def stop_at_detection(*args):
+            stdout_at_detection.append(capsys.readouterr().out)
+            raise RuntimeError("stop")
+        
+        mock_detect.side_effect = stop_at_detection
+        
+        exit_code = run_pipeline(
+            input_path=sample_txt_path,
+            output_dir=tmp_path,
+            config=sample_config,
+            summary_only=True,
+            ollama_check=start_ollama_check(sample_config) if caller_check else None,
+        )
+        
+        assert exit_code == 1
+        assert ("✓ Ollama is available" in stdout_at_detection[0].splitlines()) is caller_check
 
     @patch('app.pipeline.check_ollama_availability')
     def test_pipeline_toc_only_no_ollama_needed(self, mock_ollama_check, sample_txt_path, temp_output_dir, sample_config):